@@ -9,16 +9,125 @@ import logging
 import os
 from pathlib import Path
 
-from qdrant_client import AsyncQdrantClient
+from qdrant_client import AsyncQdrantClient, models
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+BATCH_SIZE = 100
+UPLOAD_CONCURRENCY = 8
+MAX_PENDING_BATCHES = 4
+DEFAULT_INDEXING_THRESHOLD = 20000
+COLLECTION_CONCURRENCY = 4
+
+
+async def migrate_one(
+    local_client: AsyncQdrantClient,
+    server_client: AsyncQdrantClient,
+    coll_name: str,
+    sem: asyncio.Semaphore,
+):
+    """Migrate a single collection, holding the semaphore for the duration"""
+    async with sem:
+        await _migrate_collection(local_client, server_client, coll_name)
+
+
+async def _migrate_collection(
+    local_client: AsyncQdrantClient, server_client: AsyncQdrantClient, coll_name: str
+):
+    """Copy one collection's points from local storage to the server"""
+    logger.info(f"📦 Migrating collection: {coll_name}")
+
+    # Get collection info
+    coll_info = await local_client.get_collection(coll_name)
+
+    # Skip HNSW maintenance while bulk loading; the index is built once at the
+    # end instead of being updated after every batch
+    bulk_load_config = models.OptimizersConfigDiff(indexing_threshold=0)
+
+    # Create collection on server with same config
+    try:
+        await server_client.create_collection(
+            collection_name=coll_name,
+            vectors_config=coll_info.config.params.vectors,
+            optimizers_config=bulk_load_config,
+        )
+        logger.info(f"✅ Created collection {coll_name} on server")
+    except Exception:
+        logger.info(f"Collection {coll_name} already exists on server, continuing...")
+        await server_client.update_collection(
+            collection_name=coll_name, optimizer_config=bulk_load_config
+        )
+
+    # One producer scrolls local pages into a bounded queue while several
+    # consumers upload them, so reads and writes run concurrently.
+    queue: asyncio.Queue = asyncio.Queue(maxsize=MAX_PENDING_BATCHES)
+    total_migrated = 0
+
+    async def scroll(offset):
+        return await local_client.scroll(
+            collection_name=coll_name,
+            limit=BATCH_SIZE,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True,
+        )
+
+    async def producer():
+        # The last page is returned rather than queued, so it can be written
+        # after every other batch
+        points, offset = await scroll(None)
+        while points and offset is not None:
+            await queue.put(points)
+            points, offset = await scroll(offset)
+        for _ in range(UPLOAD_CONCURRENCY):
+            await queue.put(None)
+        return points
+
+    async def upload(points, wait: bool):
+        nonlocal total_migrated
+        await server_client.upsert(
+            collection_name=coll_name,
+            points=points,
+            wait=wait,
+        )
+        total_migrated += len(points)
+        logger.info(f"  Migrated {total_migrated} points...")
+
+    async def consumer():
+        while (points := await queue.get()) is not None:
+            await upload(points, wait=False)
+
+    last_points, *_ = await asyncio.gather(
+        producer(), *(consumer() for _ in range(UPLOAD_CONCURRENCY))
+    )
+
+    # The server applies a collection's updates in order, so waiting on the
+    # final batch also waits for every earlier wait=False batch to be applied
+    if last_points:
+        await upload(last_points, wait=True)
+
+    # Re-enable indexing with the source collection's threshold now that all
+    # points are on the server
+    indexing_threshold = coll_info.config.optimizer_config.indexing_threshold
+    if indexing_threshold is None:
+        indexing_threshold = DEFAULT_INDEXING_THRESHOLD
+    await server_client.update_collection(
+        collection_name=coll_name,
+        optimizer_config=models.OptimizersConfigDiff(
+            indexing_threshold=indexing_threshold
+        ),
+    )
+
+    logger.info(f"✅ Migrated {total_migrated} points from {coll_name}")
+
+
 async def migrate():
     """Migrate data from local storage to Qdrant server"""
     local_path = os.getenv("QDRANT_LOCAL_PATH", "./qdrant-data")
     server_url = os.getenv("QDRANT_URL", "http://localhost:6333")
+    grpc_port = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
 
     logger.info(f"🔄 Starting migration from {local_path} to {server_url}")
 
@@ -33,65 +142,27 @@ async def migrate():
     logger.info("📂 Connecting to local storage...")
     local_client = AsyncQdrantClient(path=local_path)
 
-    # Connect to server
+    # Connect to server over gRPC: protobuf encodes vector-heavy batches far
+    # more compactly than JSON
     logger.info("🌐 Connecting to Qdrant server...")
-    server_client = AsyncQdrantClient(url=server_url)
+    server_client = AsyncQdrantClient(
+        url=server_url, prefer_grpc=True, grpc_port=grpc_port
+    )
 
     try:
         # Get all collections from local storage
         collections = await local_client.get_collections()
         logger.info(f"Found {len(collections.collections)} collections to migrate")
 
-        for collection in collections.collections:
-            coll_name = collection.name
-            logger.info(f"📦 Migrating collection: {coll_name}")
-
-            # Get collection info
-            coll_info = await local_client.get_collection(coll_name)
-
-            # Create collection on server with same config
-            try:
-                await server_client.create_collection(
-                    collection_name=coll_name,
-                    vectors_config=coll_info.config.params.vectors,
-                )
-                logger.info(f"✅ Created collection {coll_name} on server")
-            except Exception:
-                logger.info(
-                    f"Collection {coll_name} already exists on server, continuing..."
-                )
-
-            # Scroll through all points and migrate
-            offset = None
-            total_migrated = 0
-            batch_size = 100
-
-            while True:
-                # Get batch of points
-                points, offset = await local_client.scroll(
-                    collection_name=coll_name,
-                    limit=batch_size,
-                    offset=offset,
-                    with_payload=True,
-                    with_vectors=True,
-                )
-
-                if not points:
-                    break
-
-                # Upload to server
-                await server_client.upsert(
-                    collection_name=coll_name,
-                    points=points,
-                )
-
-                total_migrated += len(points)
-                logger.info(f"  Migrated {total_migrated} points...")
-
-                if offset is None:
-                    break
-
-            logger.info(f"✅ Migrated {total_migrated} points from {coll_name}")
+        # Collections are independent, so migrate several at once while
+        # capping how many hit the server concurrently
+        sem = asyncio.Semaphore(COLLECTION_CONCURRENCY)
+        await asyncio.gather(
+            *(
+                migrate_one(local_client, server_client, collection.name, sem)
+                for collection in collections.collections
+            )
+        )
 
         logger.info("🎉 Migration complete!")
         logger.info(f"💡 You can now delete the local storage: rm -rf {local_path}")
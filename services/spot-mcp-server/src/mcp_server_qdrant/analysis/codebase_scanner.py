@@ -1,15 +1,80 @@
 """Scans and indexes codebase structure."""
 
 import ast
-import fnmatch
 import logging
+import mmap
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+import pathspec
 
 logger = logging.getLogger(__name__)
 
+# File extension -> language for files the scanner analyzes
+LANGUAGE_MAP: Dict[str, str] = {
+    ".py": "python",
+    ".js": "javascript",
+    ".ts": "typescript",
+    ".jsx": "javascript",
+    ".tsx": "typescript",
+    ".java": "java",
+    ".go": "go",
+    ".rs": "rust",
+    ".cpp": "cpp",
+    ".c": "c",
+    ".h": "c",
+    ".hpp": "cpp",
+    ".rb": "ruby",
+    ".php": "php",
+    ".swift": "swift",
+    ".kt": "kotlin",
+    ".scala": "scala",
+    ".sh": "shell",
+    ".ps1": "powershell",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+    ".json": "json",
+    ".toml": "toml",
+    ".md": "markdown",
+}
+
+# Read size used when counting lines over raw bytes
+LINE_COUNT_CHUNK_SIZE = 1 << 16
+
+# Below this many files, process pool startup costs more than it saves; spawned
+# workers start a fresh interpreter and import this package first
+PARALLEL_MIN_FILES = 128
+
+# Scanner built once in each worker process by the pool initializer
+_worker_scanner: Optional["CodebaseScanner"] = None
+
+
+def _init_worker(root_path: str):
+    # analyze_file only needs the root, so ignore rules aren't sent or re-read
+    global _worker_scanner
+    _worker_scanner = CodebaseScanner(root_path, respect_gitignore=False)
+
+
+def _analyze_in_worker(file_path: Path) -> Optional["FileInfo"]:
+    return _worker_scanner.analyze_file(file_path)
+
+
+def _count_lines(chunks: Iterable[bytes]) -> int:
+    """Count lines across byte chunks, including an unterminated last line."""
+    line_count = 0
+    last_byte = b"\n"
+    for chunk in chunks:
+        line_count += chunk.count(b"\n")
+        last_byte = chunk[-1:]
+    if last_byte != b"\n":
+        line_count += 1
+    return line_count
+
 
 @dataclass
 class FileInfo:
@@ -17,8 +82,8 @@ class FileInfo:
 
     path: str
     language: str
-    size: int
-    line_count: int
+    size: int  # Bytes on disk, from stat
+    line_count: int  # Newline count, plus one for an unterminated last line
     functions: List[Dict[str, Any]]
     classes: List[Dict[str, Any]]
     imports: List[str]
@@ -101,106 +166,75 @@ class CodebaseScanner:
         self.ignore_patterns = ignore_patterns or default_ignores
         self.gitignore_patterns = []
 
-        # Parse .gitignore if requested
+        # Read .gitignore if requested; pathspec handles comments, anchoring
+        # and negation itself, so the raw lines are kept as they are
         if respect_gitignore:
             gitignore_path = self.root_path / ".gitignore"
             if gitignore_path.exists():
-                self.gitignore_patterns = self._parse_gitignore(gitignore_path)
+                try:
+                    self.gitignore_patterns = gitignore_path.read_text(
+                        encoding="utf-8"
+                    ).splitlines()
+                except Exception as e:
+                    logger.warning(f"Failed to parse .gitignore: {e}")
+
+        # Compile every pattern into a single gitignore-style matcher
+        self._spec = pathspec.PathSpec.from_lines(
+            "gitwildmatch", self.ignore_patterns + self.gitignore_patterns
+        )
 
-    def _parse_gitignore(self, gitignore_path: Path) -> List[str]:
-        """Parse .gitignore file and extract patterns."""
-        patterns = []
-        try:
-            with open(gitignore_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    # Skip empty lines and comments
-                    if line and not line.startswith("#"):
-                        # Remove leading slash for root-relative patterns
-                        if line.startswith("/"):
-                            line = line[1:]
-                        # Remove trailing slash
-                        if line.endswith("/"):
-                            line = line[:-1]
-                        patterns.append(line)
-        except Exception as e:
-            logger.warning(f"Failed to parse .gitignore: {e}")
-        return patterns
-
-    def should_ignore(self, path: Path) -> bool:
-        """Check if a path should be ignored."""
-        path_str = str(path.relative_to(self.root_path))
-        path_name = path.name
-
-        # Check default patterns
-        for pattern in self.ignore_patterns:
-            # Wildcard pattern matching
-            if "*" in pattern:
-                if fnmatch.fnmatch(path_name, pattern) or fnmatch.fnmatch(
-                    path_str, pattern
-                ):
-                    return True
-            # Substring matching
-            elif pattern in path_str:
-                return True
-
-        # Check gitignore patterns
-        for pattern in self.gitignore_patterns:
-            # Simple glob matching
-            if fnmatch.fnmatch(path_str, pattern) or fnmatch.fnmatch(
-                path_str, f"**/{pattern}"
-            ):
-                return True
-            # Directory matching
-            if pattern in path_str.split(os.sep):
-                return True
-
-        return False
+        # Entries whose name is itself a literal pattern (node_modules, .git, ...)
+        # are rejected with a set lookup before any pattern matching. A negated
+        # gitignore line could re-include such an entry, so skip the shortcut then.
+        if any(line.startswith("!") for line in self.gitignore_patterns):
+            self._ignored_names = frozenset()
+        else:
+            self._ignored_names = frozenset(
+                p for p in self.ignore_patterns if not any(c in p for c in "*?[]/!\\")
+            )
+
+    def should_ignore(self, rel_path: str, is_dir: bool = False) -> bool:
+        """
+        Check if a path should be ignored.
+
+        Args:
+            rel_path: Path relative to the scan root
+            is_dir: Whether the path is a directory (for patterns ending in '/')
+        """
+        if is_dir:
+            rel_path += "/"
+        return self._spec.match_file(rel_path)
 
     def detect_language(self, file_path: Path) -> Optional[str]:
         """Detect programming language from file extension."""
         ext = file_path.suffix.lower()
-        language_map = {
-            ".py": "python",
-            ".js": "javascript",
-            ".ts": "typescript",
-            ".jsx": "javascript",
-            ".tsx": "typescript",
-            ".java": "java",
-            ".go": "go",
-            ".rs": "rust",
-            ".cpp": "cpp",
-            ".c": "c",
-            ".h": "c",
-            ".hpp": "cpp",
-            ".rb": "ruby",
-            ".php": "php",
-            ".swift": "swift",
-            ".kt": "kotlin",
-            ".scala": "scala",
-            ".sh": "shell",
-            ".ps1": "powershell",
-            ".yaml": "yaml",
-            ".yml": "yaml",
-            ".json": "json",
-            ".toml": "toml",
-            ".md": "markdown",
-        }
-        return language_map.get(ext)
+        return LANGUAGE_MAP.get(ext)
 
     def analyze_python_file(self, file_path: Path) -> FileInfo:
         """Analyze a Python file and extract structure."""
+        size = 0
+        line_count = 0
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-                tree = ast.parse(content, filename=str(file_path))
+            # Parse straight from a read-only mapping of the file; ast.parse takes
+            # the raw bytes, so no decoded copy of the source is ever built
+            with open(file_path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as source:
+                        line_count = _count_lines(
+                            source[i : i + LINE_COUNT_CHUNK_SIZE]
+                            for i in range(0, size, LINE_COUNT_CHUNK_SIZE)
+                        )
+                        tree = ast.parse(source, filename=str(file_path))
+                else:
+                    tree = ast.parse(b"", filename=str(file_path))
         except Exception as e:
             logger.warning(f"Failed to parse {file_path}: {e}")
             return FileInfo(
                 path=str(file_path.relative_to(self.root_path)),
                 language="python",
-                size=len(content),
-                line_count=len(content.splitlines()),
+                size=size,
+                line_count=line_count,
                 functions=[],
                 classes=[],
                 imports=[],
@@ -209,65 +243,82 @@ class CodebaseScanner:
 
         functions = []
         classes = []
-        imports = []
-        exports = []
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                functions.append(
-                    {
-                        "name": node.name,
-                        "line": node.lineno,
-                        "args": [arg.arg for arg in node.args.args],
-                        "docstring": ast.get_docstring(node),
-                    }
-                )
-            elif isinstance(node, ast.ClassDef):
-                methods = [
-                    {
-                        "name": n.name,
-                        "line": n.lineno,
-                    }
-                    for n in node.body
-                    if isinstance(n, ast.FunctionDef)
-                ]
-                classes.append(
-                    {
-                        "name": node.name,
-                        "line": node.lineno,
-                        "methods": methods,
-                        "docstring": ast.get_docstring(node),
-                    }
-                )
-            elif isinstance(node, ast.Import):
-                for alias in node.names:
-                    imports.append(alias.name)
-            elif isinstance(node, ast.ImportFrom):
-                if node.module:
-                    imports.append(node.module)
-                for alias in node.names:
-                    imports.append(
-                        f"{node.module}.{alias.name}" if node.module else alias.name
+        imports: Set[str] = set()
+        exports: Set[str] = set()
+
+        # Symbols live at module level, in class bodies or under top-level
+        # guards (if TYPE_CHECKING, try/except ImportError), so walk only those
+        # statement lists instead of every expression node in the tree.
+        def visit(body: List[ast.stmt], module_level: bool):
+            for node in body:
+                if isinstance(node, ast.FunctionDef):
+                    functions.append(
+                        {
+                            "name": node.name,
+                            "line": node.lineno,
+                            "args": [arg.arg for arg in node.args.args],
+                            "docstring": ast.get_docstring(node),
+                        }
                     )
-
-        # Find exports (top-level assignments, functions, classes)
-        for node in tree.body:
-            if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
-                exports.append(node.name)
-            elif isinstance(node, ast.Assign):
-                for target in node.targets:
-                    if isinstance(target, ast.Name):
-                        exports.append(target.id)
+                    if module_level:
+                        exports.add(node.name)
+                elif isinstance(node, ast.ClassDef):
+                    methods = [
+                        {
+                            "name": n.name,
+                            "line": n.lineno,
+                        }
+                        for n in node.body
+                        if isinstance(n, ast.FunctionDef)
+                    ]
+                    classes.append(
+                        {
+                            "name": node.name,
+                            "line": node.lineno,
+                            "methods": methods,
+                            "docstring": ast.get_docstring(node),
+                        }
+                    )
+                    if module_level:
+                        exports.add(node.name)
+                    visit(node.body, False)
+                elif isinstance(node, ast.Import):
+                    for alias in node.names:
+                        imports.add(alias.name)
+                elif isinstance(node, ast.ImportFrom):
+                    if node.module:
+                        imports.add(node.module)
+                    for alias in node.names:
+                        imports.add(
+                            f"{node.module}.{alias.name}" if node.module else alias.name
+                        )
+                elif isinstance(node, ast.Assign):
+                    if module_level:
+                        for target in node.targets:
+                            if isinstance(target, ast.Name):
+                                exports.add(target.id)
+                elif isinstance(node, ast.If):
+                    visit(node.body, False)
+                    visit(node.orelse, False)
+                elif isinstance(node, ast.Try):
+                    visit(node.body, False)
+                    for handler in node.handlers:
+                        visit(handler.body, False)
+                    visit(node.orelse, False)
+                    visit(node.finalbody, False)
+
+        visit(tree.body, True)
 
         return FileInfo(
             path=str(file_path.relative_to(self.root_path)),
             language="python",
-            size=len(content),
-            line_count=len(content.splitlines()),
+            size=size,
+            line_count=line_count,
             functions=functions,
             classes=classes,
-            imports=list(set(imports)),
-            exports=list(set(exports)),
+            # Sorted, so results don't depend on the process's string hash seed
+            imports=sorted(imports),
+            exports=sorted(exports),
         )
 
     def analyze_file(self, file_path: Path) -> Optional[FileInfo]:
@@ -279,24 +330,79 @@ class CodebaseScanner:
         if language == "python":
             return self.analyze_python_file(file_path)
 
-        # For non-Python files, extract basic info
+        # For non-Python files, extract basic info without loading the file:
+        # size comes from stat and lines are counted over raw byte chunks
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            size = file_path.stat().st_size
+            with open(file_path, "rb") as f:
+                line_count = _count_lines(
+                    iter(lambda: f.read(LINE_COUNT_CHUNK_SIZE), b"")
+                )
         except Exception:
             return None
 
         return FileInfo(
             path=str(file_path.relative_to(self.root_path)),
             language=language,
-            size=len(content),
-            line_count=len(content.splitlines()),
+            size=size,
+            line_count=line_count,
             functions=[],
             classes=[],
             imports=[],
             exports=[],
         )
 
+    def _analyze_files(self, paths: List[Path]) -> List[Optional[FileInfo]]:
+        """Analyze files, fanning AST parsing out to worker processes."""
+        if len(paths) >= PARALLEL_MIN_FILES and (os.cpu_count() or 1) > 1:
+            try:
+                # Spawn rather than fork: the server process runs threads
+                # (embedding model, event loop executor) that fork can deadlock
+                with ProcessPoolExecutor(
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(str(self.root_path),),
+                ) as executor:
+                    return list(executor.map(_analyze_in_worker, paths, chunksize=32))
+            except (BrokenProcessPool, NotImplementedError, OSError) as e:
+                logger.warning(f"Parallel scan unavailable, scanning serially: {e}")
+
+        return [self.analyze_file(path) for path in paths]
+
+    def _walk_files(self) -> Iterator[str]:
+        """
+        Yield paths of files worth analyzing, pruning ignored directories.
+
+        Works on os.scandir entries and plain strings so no Path objects are
+        built for entries that end up ignored.
+        """
+        stack = [(str(self.root_path), "")]
+        while stack:
+            dir_path, rel_prefix = stack.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = list(it)
+            except OSError as e:
+                logger.warning(f"Failed to list {dir_path}: {e}")
+                continue
+
+            for entry in entries:
+                name = entry.name
+                if name in self._ignored_names:
+                    continue
+                rel_path = rel_prefix + name
+
+                if entry.is_dir():
+                    # Like os.walk, don't descend into symlinked directories
+                    if not entry.is_symlink() and not self.should_ignore(
+                        rel_path, is_dir=True
+                    ):
+                        stack.append((entry.path, rel_path + os.sep))
+                else:
+                    ext = os.path.splitext(name)[1].lower()
+                    if ext in LANGUAGE_MAP and not self.should_ignore(rel_path):
+                        yield entry.path
+
     def scan(self) -> ProjectStructure:
         """Scan the entire codebase."""
         files = []
@@ -304,33 +410,27 @@ class CodebaseScanner:
         entry_points = []
         main_modules = []
 
-        for root, dirs, filenames in os.walk(self.root_path):
-            # Filter out ignored directories
-            dirs[:] = [d for d in dirs if not self.should_ignore(Path(root) / d)]
-
-            for filename in filenames:
-                file_path = Path(root) / filename
-                if self.should_ignore(file_path):
-                    continue
-
-                file_info = self.analyze_file(file_path)
-                if file_info:
-                    files.append(file_info)
-                    languages[file_info.language] = (
-                        languages.get(file_info.language, 0) + 1
-                    )
-
-                    # Detect entry points
-                    if filename in [
-                        "main.py",
-                        "__main__.py",
-                        "index.js",
-                        "main.go",
-                        "main.rs",
-                    ]:
-                        entry_points.append(file_info.path)
-                    if "main" in filename.lower() or "index" in filename.lower():
-                        main_modules.append(file_info.path)
+        # Phase 1: walk the tree and collect candidate files (no file I/O)
+        candidates = [Path(path) for path in self._walk_files()]
+
+        # Phase 2: analyze files, in parallel when there are enough of them
+        for file_info in self._analyze_files(candidates):
+            if file_info:
+                files.append(file_info)
+                languages[file_info.language] = languages.get(file_info.language, 0) + 1
+
+                # Detect entry points
+                filename = os.path.basename(file_info.path)
+                if filename in [
+                    "main.py",
+                    "__main__.py",
+                    "index.js",
+                    "main.go",
+                    "main.rs",
+                ]:
+                    entry_points.append(file_info.path)
+                if "main" in filename.lower() or "index" in filename.lower():
+                    main_modules.append(file_info.path)
 
         return ProjectStructure(
             root_path=str(self.root_path),
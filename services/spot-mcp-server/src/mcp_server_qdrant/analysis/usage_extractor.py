@@ -10,6 +10,23 @@ from typing import List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Nodes that can contain statements; imports and definitions are always
+# statements, so expression subtrees never need to be visited to find them
+_STATEMENT_CONTAINERS = (ast.stmt, ast.excepthandler, ast.match_case)
+
+
+def _iter_statements(tree: ast.AST):
+    """Yield every statement in the tree using an explicit stack."""
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(
+            child
+            for child in ast.iter_child_nodes(node)
+            if isinstance(child, _STATEMENT_CONTAINERS)
+        )
+
 
 @dataclass
 class UsageExample:
@@ -45,7 +62,7 @@ class UsageExtractor:
 
         # Track what's imported (these are the names we care about)
         imported_names = set()
-        for node in ast.walk(tree):
+        for node in _iter_statements(tree):
             if isinstance(node, ast.Import):
                 for alias in node.names:
                     name = alias.asname if alias.asname else alias.name
@@ -62,7 +79,7 @@ class UsageExtractor:
 
         # Track what's being defined locally (skip these)
         defined_names = set()
-        for node in ast.walk(tree):
+        for node in _iter_statements(tree):
             if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
                 defined_names.add(node.name)
 
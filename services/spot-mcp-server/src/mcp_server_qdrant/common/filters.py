@@ -1,13 +1,64 @@
-from typing import Any
+from typing import Any, Callable
 
-from mcp_server_qdrant.qdrant import ArbitraryFilter
-from mcp_server_qdrant.settings import METADATA_PATH, FilterableField
+from mcp_server_qdrant.settings import FilterableField
 from qdrant_client import models
 
 
+def _match_value(key: str, value: Any) -> models.FieldCondition:
+    return models.FieldCondition(key=key, match=models.MatchValue(value=value))
+
+
+def _match_any(key: str, value: Any) -> models.FieldCondition:
+    return models.FieldCondition(key=key, match=models.MatchAny(any=value))
+
+
+def _match_except(key: str, value: Any) -> models.FieldCondition:
+    return models.FieldCondition(key=key, match=models.MatchExcept(**{"except": value}))
+
+
+def _range(bound: str) -> Callable[[str, Any], models.FieldCondition]:
+    def build(key: str, value: Any) -> models.FieldCondition:
+        return models.FieldCondition(key=key, range=models.Range(**{bound: value}))
+
+    return build
+
+
+# (field_type, condition) -> (goes into must_not, condition builder)
+_CONDITION_BUILDERS: dict[
+    tuple[str, str], tuple[bool, Callable[[str, Any], models.FieldCondition]]
+] = {
+    ("keyword", "=="): (False, _match_value),
+    ("keyword", "!="): (True, _match_value),
+    ("keyword", "any"): (False, _match_any),
+    ("keyword", "except"): (False, _match_except),
+    ("integer", "=="): (False, _match_value),
+    ("integer", "!="): (True, _match_value),
+    ("integer", ">"): (False, _range("gt")),
+    ("integer", ">="): (False, _range("gte")),
+    ("integer", "<"): (False, _range("lt")),
+    ("integer", "<="): (False, _range("lte")),
+    ("integer", "any"): (False, _match_any),
+    ("integer", "except"): (False, _match_except),
+    # For float values, we only support range comparisons
+    ("float", ">"): (False, _range("gt")),
+    ("float", ">="): (False, _range("gte")),
+    ("float", "<"): (False, _range("lt")),
+    ("float", "<="): (False, _range("lte")),
+    ("boolean", "=="): (False, _match_value),
+    ("boolean", "!="): (True, _match_value),
+}
+
+_FIELD_TYPES = frozenset(field_type for field_type, _ in _CONDITION_BUILDERS)
+
+
 def make_filter(
     filterable_fields: dict[str, FilterableField], values: dict[str, Any]
-) -> ArbitraryFilter:
+) -> models.Filter:
+    """
+    Build a Qdrant filter from the values of the filterable fields. The filter model is
+    returned as is, since qdrant-client accepts it directly and dumping it to a dict
+    would only be parsed back again.
+    """
     must_conditions = []
     must_not_conditions = []
 
@@ -23,152 +74,38 @@ def make_filter(
             else:
                 continue
 
-        field_name = f"{METADATA_PATH}.{raw_field_name}"
-
-        if field.field_type == "keyword":
-            if field.condition == "==":
-                must_conditions.append(
-                    models.FieldCondition(
-                        key=field_name, match=models.MatchValue(value=field_value)
-                    )
-                )
-            elif field.condition == "!=":
-                must_not_conditions.append(
-                    models.FieldCondition(
-                        key=field_name, match=models.MatchValue(value=field_value)
-                    )
-                )
-            elif field.condition == "any":
-                must_conditions.append(
-                    models.FieldCondition(
-                        key=field_name, match=models.MatchAny(any=field_value)
-                    )
-                )
-            elif field.condition == "except":
-                must_conditions.append(
-                    models.FieldCondition(
-                        key=field_name,
-                        match=models.MatchExcept(**{"except": field_value}),
-                    )
-                )
-            elif field.condition is not None:
-                raise ValueError(
-                    f"Invalid condition {field.condition} for keyword field {field_name}"
-                )
-
-        elif field.field_type == "integer":
-            if field.condition == "==":
-                must_conditions.append(
-                    models.FieldCondition(
-                        key=field_name, match=models.MatchValue(value=field_value)
-                    )
-                )
-            elif field.condition == "!=":
-                must_not_conditions.append(
-                    models.FieldCondition(
-                        key=field_name, match=models.MatchValue(value=field_value)
-                    )
-                )
-            elif field.condition == ">":
-                must_conditions.append(
-                    models.FieldCondition(
-                        key=field_name, range=models.Range(gt=field_value)
-                    )
-                )
-            elif field.condition == ">=":
-                must_conditions.append(
-                    models.FieldCondition(
-                        key=field_name, range=models.Range(gte=field_value)
-                    )
-                )
-            elif field.condition == "<":
-                must_conditions.append(
-                    models.FieldCondition(
-                        key=field_name, range=models.Range(lt=field_value)
-                    )
-                )
-            elif field.condition == "<=":
-                must_conditions.append(
-                    models.FieldCondition(
-                        key=field_name, range=models.Range(lte=field_value)
-                    )
-                )
-            elif field.condition == "any":
-                must_conditions.append(
-                    models.FieldCondition(
-                        key=field_name, match=models.MatchAny(any=field_value)
-                    )
-                )
-            elif field.condition == "except":
-                must_conditions.append(
-                    models.FieldCondition(
-                        key=field_name,
-                        match=models.MatchExcept(**{"except": field_value}),
-                    )
-                )
-            elif field.condition is not None:
-                raise ValueError(
-                    f"Invalid condition {field.condition} for integer field {field_name}"
-                )
-
-        elif field.field_type == "float":
-            # For float values, we only support range comparisons
-            if field.condition == ">":
-                must_conditions.append(
-                    models.FieldCondition(
-                        key=field_name, range=models.Range(gt=field_value)
-                    )
-                )
-            elif field.condition == ">=":
-                must_conditions.append(
-                    models.FieldCondition(
-                        key=field_name, range=models.Range(gte=field_value)
-                    )
-                )
-            elif field.condition == "<":
-                must_conditions.append(
-                    models.FieldCondition(
-                        key=field_name, range=models.Range(lt=field_value)
-                    )
-                )
-            elif field.condition == "<=":
-                must_conditions.append(
-                    models.FieldCondition(
-                        key=field_name, range=models.Range(lte=field_value)
-                    )
-                )
-            elif field.condition is not None:
-                raise ValueError(
-                    f"Invalid condition {field.condition} for float field {field_name}. "
-                    "Only range comparisons (>, >=, <, <=) are supported for float values."
-                )
-
-        elif field.field_type == "boolean":
-            if field.condition == "==":
-                must_conditions.append(
-                    models.FieldCondition(
-                        key=field_name, match=models.MatchValue(value=field_value)
-                    )
-                )
-            elif field.condition == "!=":
-                must_not_conditions.append(
-                    models.FieldCondition(
-                        key=field_name, match=models.MatchValue(value=field_value)
-                    )
-                )
-            elif field.condition is not None:
-                raise ValueError(
-                    f"Invalid condition {field.condition} for boolean field {field_name}"
-                )
+        field_name = field.qdrant_key
 
-        else:
+        if field.field_type not in _FIELD_TYPES:
             raise ValueError(
                 f"Unsupported field type {field.field_type} for field {field_name}"
             )
 
-    return models.Filter(
-        must=must_conditions, must_not=must_not_conditions
-    ).model_dump()
+        builder = _CONDITION_BUILDERS.get((field.field_type, field.condition))
+        if builder is None:
+            if field.condition is None:
+                continue
+            message = f"Invalid condition {field.condition} for {field.field_type} field {field_name}"
+            if field.field_type == "float":
+                message += ". Only range comparisons (>, >=, <, <=) are supported for float values."
+            raise ValueError(message)
+
+        negate, build = builder
+        condition = build(field_name, field_value)
+        if negate:
+            must_not_conditions.append(condition)
+        else:
+            must_conditions.append(condition)
+
+    return models.Filter(must=must_conditions, must_not=must_not_conditions)
+
+
+_FIELD_TYPE_TO_SCHEMA: dict[str, models.PayloadSchemaType] = {
+    "keyword": models.PayloadSchemaType.KEYWORD,
+    "integer": models.PayloadSchemaType.INTEGER,
+    "float": models.PayloadSchemaType.FLOAT,
+    "boolean": models.PayloadSchemaType.BOOL,
+}
 
 
 def make_indexes(
@@ -177,17 +114,11 @@ def make_indexes(
     indexes = {}
 
     for field_name, field in filterable_fields.items():
-        if field.field_type == "keyword":
-            indexes[f"{METADATA_PATH}.{field_name}"] = models.PayloadSchemaType.KEYWORD
-        elif field.field_type == "integer":
-            indexes[f"{METADATA_PATH}.{field_name}"] = models.PayloadSchemaType.INTEGER
-        elif field.field_type == "float":
-            indexes[f"{METADATA_PATH}.{field_name}"] = models.PayloadSchemaType.FLOAT
-        elif field.field_type == "boolean":
-            indexes[f"{METADATA_PATH}.{field_name}"] = models.PayloadSchemaType.BOOL
-        else:
+        try:
+            indexes[field.qdrant_key] = _FIELD_TYPE_TO_SCHEMA[field.field_type]
+        except KeyError:
             raise ValueError(
                 f"Unsupported field type {field.field_type} for field {field_name}"
-            )
+            ) from None
 
     return indexes
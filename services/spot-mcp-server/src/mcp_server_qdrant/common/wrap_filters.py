@@ -1,104 +1,135 @@
 import inspect
-from functools import wraps
+from functools import lru_cache, partial
 from typing import Annotated, Callable, Optional
 
 from mcp_server_qdrant.common.filters import make_filter
 from mcp_server_qdrant.settings import FilterableField
 from pydantic import Field
 
+_POSITIONAL_OR_KEYWORD = inspect.Parameter.POSITIONAL_OR_KEYWORD
+_EMPTY = inspect.Parameter.empty
 
-def wrap_filters(
+_FIELD_TYPES: dict[str, type] = {
+    "keyword": str,
+    "integer": int,
+    "float": float,
+    "boolean": bool,
+}
+_LIST_CONDITIONS = frozenset({"any", "except"})
+
+
+@lru_cache(maxsize=None)
+def _filter_annotation(field_type: type, description: Optional[str], required: bool):
+    """Build the Annotated type for a filter parameter, shared across identical fields."""
+    if required:
+        return Annotated[field_type, Field(description=description)]  # type: ignore
+    return Annotated[Optional[field_type], Field(description=description)]  # type: ignore
+
+
+def _compile_wrapper(
     original_func: Callable, filterable_fields: dict[str, FilterableField]
 ) -> Callable:
     """
-    Wraps the original_func function: replaces `filter` parameter with multiple parameters defined by `filterable_fields`.
-    """
+    Generate a wrapper that pops each filter kwarg by name.
 
-    sig = inspect.signature(original_func)
+    The field set is fixed at decoration time, so the names are written into the
+    function body instead of being looped over on every call.
+    """
+    lines = ["def wrapper(*args, **kwargs):", "    filter_values = {}"]
+    for field_name in filterable_fields:
+        name = repr(field_name)
+        lines.append(
+            f"    if {name} in kwargs: filter_values[{name}] = kwargs.pop({name})"
+        )
+    lines.append(
+        "    return original_func(**kwargs, query_filter=make_filter(filter_values))"
+    )
 
-    @wraps(original_func)
-    def wrapper(*args, **kwargs):
-        # Start with fixed values
-        filter_values = {}
+    namespace = {
+        "original_func": original_func,
+        # The field definitions never change, so bind them once
+        "make_filter": partial(make_filter, filterable_fields),
+    }
+    exec("\n".join(lines), namespace)
+    return namespace["wrapper"]
 
-        for field_name in filterable_fields:
-            if field_name in kwargs:
-                filter_values[field_name] = kwargs.pop(field_name)
 
-        query_filter = make_filter(filterable_fields, filter_values)
+def wrap_filters(
+    original_func: Callable, filterable_fields: dict[str, FilterableField]
+) -> Callable:
+    """
+    Wraps the original_func function: replaces `filter` parameter with multiple parameters defined by `filterable_fields`.
+    """
 
-        return original_func(**kwargs, query_filter=query_filter)
+    sig = inspect.signature(original_func)
+    wrapper = _compile_wrapper(original_func, filterable_fields)
+    # Copied by hand instead of functools.wraps so no __wrapped__ is set and the
+    # signature built below cannot be bypassed by unwrapping
+    for attr in ("__module__", "__name__", "__qualname__", "__doc__"):
+        if hasattr(original_func, attr):
+            setattr(wrapper, attr, getattr(original_func, attr))
 
     # Replace `query_filter` signature with parameters from `filterable_fields`
 
-    param_names = []
-
-    for param_name in sig.parameters:
-        if param_name == "query_filter":
-            continue
-        param_names.append(param_name)
-
-    new_params = [sig.parameters[param_name] for param_name in param_names]
+    # Annotations are collected alongside the parameters they belong to
+    new_params = [
+        param for name, param in sig.parameters.items() if name != "query_filter"
+    ]
+    new_annotations = {
+        param.name: param.annotation
+        for param in new_params
+        if param.annotation is not _EMPTY
+    }
     required_new_params = []
     optional_new_params = []
+    required_annotations = {}
+    optional_annotations = {}
 
     # Create a new signature parameters from `filterable_fields`
     for field in filterable_fields.values():
         field_name = field.name
-        field_type: type
-        if field.field_type == "keyword":
-            field_type = str
-        elif field.field_type == "integer":
-            field_type = int
-        elif field.field_type == "float":
-            field_type = float
-        elif field.field_type == "boolean":
-            field_type = bool
-        else:
+        field_type = _FIELD_TYPES.get(field.field_type)
+        if field_type is None:
             raise ValueError(f"Unsupported field type: {field.field_type}")
 
-        if field.condition in {"any", "except"}:
+        if field.condition in _LIST_CONDITIONS:
             if field_type not in {str, int}:
                 raise ValueError(
                     f'Only "keyword" and "integer" types are supported for "{field.condition}" condition'
                 )
             field_type = list[field_type]  # type: ignore
 
+        annotation = _filter_annotation(field_type, field.description, field.required)
         if field.required:
-            annotation = Annotated[field_type, Field(description=field.description)]  # type: ignore
             parameter = inspect.Parameter(
                 name=field_name,
-                kind=inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                kind=_POSITIONAL_OR_KEYWORD,
                 annotation=annotation,
             )
             required_new_params.append(parameter)
+            required_annotations[field_name] = annotation
         else:
-            annotation = Annotated[  # type: ignore
-                Optional[field_type], Field(description=field.description)
-            ]
             parameter = inspect.Parameter(
                 name=field_name,
-                kind=inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                kind=_POSITIONAL_OR_KEYWORD,
                 default=None,
                 annotation=annotation,
             )
             optional_new_params.append(parameter)
+            optional_annotations[field_name] = annotation
 
     new_params.extend(required_new_params)
     new_params.extend(optional_new_params)
+    new_annotations.update(required_annotations)
+    new_annotations.update(optional_annotations)
 
     # Set the new __signature__ for introspection
     new_signature = sig.replace(parameters=new_params)
     wrapper.__signature__ = new_signature  # type: ignore
 
     # Set the new __annotations__ for introspection
-    new_annotations = {}
-    for param in new_signature.parameters.values():
-        if param.annotation != inspect.Parameter.empty:
-            new_annotations[param.name] = param.annotation
-
     # Add return type annotation if it exists
-    if new_signature.return_annotation != inspect.Parameter.empty:
+    if new_signature.return_annotation is not _EMPTY:
         new_annotations["return"] = new_signature.return_annotation
 
     wrapper.__annotations__ = new_annotations
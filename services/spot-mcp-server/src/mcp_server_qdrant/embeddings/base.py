@@ -23,3 +23,7 @@ class EmbeddingProvider(ABC):
     def get_vector_size(self) -> int:
         """Get the size of the vector for the Qdrant collection."""
         pass
+
+    def close(self):
+        """Release resources held by the provider, such as worker threads."""
+        pass
@@ -1,9 +1,14 @@
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 
 from fastembed import TextEmbedding
 from fastembed.common.model_description import DenseModelDescription
 from mcp_server_qdrant.embeddings.base import EmbeddingProvider
 
+# ONNX Runtime already spreads each inference over every core, so more than
+# one embedding call at a time would only oversubscribe the CPU
+EMBEDDING_WORKERS = 1
+
 
 class FastEmbedProvider(EmbeddingProvider):
     """
@@ -14,25 +19,34 @@ class FastEmbedProvider(EmbeddingProvider):
     def __init__(self, model_name: str):
         self.model_name = model_name
         self.embedding_model = TextEmbedding(model_name)
+        # Dedicated pool, so embedding calls don't queue behind other work
+        # in the event loop's default executor
+        self._executor = ThreadPoolExecutor(
+            max_workers=EMBEDDING_WORKERS, thread_name_prefix="fastembed"
+        )
 
     async def embed_documents(self, documents: list[str]) -> list[list[float]]:
         """Embed a list of documents into vectors."""
         # Run in a thread pool since FastEmbed is synchronous
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         embeddings = await loop.run_in_executor(
-            None, lambda: list(self.embedding_model.passage_embed(documents))
+            self._executor, lambda: list(self.embedding_model.passage_embed(documents))
         )
         return [embedding.tolist() for embedding in embeddings]
 
     async def embed_query(self, query: str) -> list[float]:
         """Embed a query into a vector."""
         # Run in a thread pool since FastEmbed is synchronous
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         embeddings = await loop.run_in_executor(
-            None, lambda: list(self.embedding_model.query_embed([query]))
+            self._executor, lambda: list(self.embedding_model.query_embed([query]))
         )
         return embeddings[0].tolist()
 
+    def close(self):
+        """Shut down the embedding thread pool."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
     def get_vector_name(self) -> str:
         """
         Return the name of the vector for the Qdrant collection.
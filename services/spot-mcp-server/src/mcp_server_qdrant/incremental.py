@@ -1,20 +1,41 @@
 """Incremental indexing with hash-based change detection."""
 
 import hashlib
+import json
 import logging
+import mmap
+import os
 import time
-from typing import Any, Dict, List, Set
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
+# Files above this size are hashed through mmap instead of a single read
+HASH_MMAP_THRESHOLD = 1 << 16
+
+# Below this many files get_changed_files hashes on the calling thread
+PARALLEL_HASH_MIN_FILES = 8
+
+# Bump when the hash algorithm or state layout changes; older state is discarded
+STATE_VERSION = 1
+
+
+ROOT_HASH_SIZE = hashlib.sha1().digest_size
+
+
+def _entry_digest(file_path: str, digest: bytes) -> int:
+    """Per-file contribution to the tracker's root hash."""
+    entry = file_path.encode("utf-8", "surrogateescape") + b"\0" + digest
+    return int.from_bytes(hashlib.sha1(entry, usedforsecurity=False).digest(), "big")
+
 
 class FileHashTracker:
     """Track file hashes to detect changes for incremental indexing."""
 
-    def __init__(self):
-        self.file_hashes: Dict[str, str] = {}  # {file_path: hash}
-        self.last_check: Dict[str, float] = {}  # {file_path: timestamp}
-        self.indexable_extensions: Set[str] = {
+    INDEXABLE_EXTENSIONS: FrozenSet[str] = frozenset(
+        {
             ".py",
             ".js",
             ".ts",
@@ -47,100 +68,331 @@ class FileHashTracker:
             ".json",
             ".toml",
         }
+    )
 
-    def compute_hash(self, content: str) -> str:
-        """Compute MD5 hash of file content."""
-        try:
-            return hashlib.md5(content.encode("utf-8")).hexdigest()
-        except (UnicodeEncodeError, AttributeError):
-            # Fallback for binary or non-UTF8 content
-            if isinstance(content, bytes):
-                return hashlib.md5(content).hexdigest()
-            # For strings that can't be UTF-8 encoded, use latin-1
-            return hashlib.md5(content.encode("latin-1", errors="ignore")).hexdigest()
+    def __init__(self, extra_extensions: Iterable[str] = ()):
+        self.file_hashes: Dict[str, bytes] = {}  # {file_path: raw digest}
+        # XOR of _entry_digest over file_hashes, maintained as entries change
+        self._root_hash = 0
+        self.last_check: Dict[str, float] = {}  # {file_path: timestamp}
+        # Cached (timestamp, file_path) extremes of last_check, None when unknown
+        self._oldest_check: Optional[Tuple[float, str]] = None
+        self._newest_check: Optional[Tuple[float, str]] = None
+        # {file_path: (size, mtime_ns)} as seen when the hash was taken from disk
+        self.file_stats: Dict[str, Tuple[int, int]] = {}
+        # Shares the class-level frozenset unless extra extensions are given
+        extra = frozenset(ext.lower() for ext in extra_extensions)
+        self.indexable_extensions: FrozenSet[str] = (
+            self.INDEXABLE_EXTENSIONS | extra if extra else self.INDEXABLE_EXTENSIONS
+        )
+
+    def compute_hash(self, content: Union[bytes, str]) -> bytes:
+        """
+        Compute SHA-1 hash of file content (change detection, not security).
+
+        Pass bytes straight from open(path, "rb") to skip the encode pass.
+        """
+        if isinstance(content, str):
+            content = content.encode("utf-8", "surrogateescape")
+        return hashlib.sha1(content, usedforsecurity=False).digest()
+
+    def compute_hash_from_path(self, file_path: str) -> bytes:
+        """Compute the same hash as compute_hash, reading the file from disk."""
+        digest = hashlib.sha1(usedforsecurity=False)
+        with open(file_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size > HASH_MMAP_THRESHOLD:
+                # hashlib releases the GIL while hashing the mapped pages
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    digest.update(mm)
+            else:
+                digest.update(f.read())
+        return digest.digest()
 
     def is_indexable(self, file_path: str) -> bool:
         """Check if file type should be indexed."""
-        import os
+        return os.path.splitext(file_path)[1].lower() in self.indexable_extensions
 
-        _, ext = os.path.splitext(file_path)
-        return ext.lower() in self.indexable_extensions
+    def _hash_from_disk(
+        self, file_path: str
+    ) -> Tuple[Optional[Tuple[int, int]], Optional[bytes]]:
+        """
+        Stat a file and hash it, unless size and mtime match the last check.
+
+        Only reads tracker state, so it is safe to run from worker threads.
+
+        Returns:
+            (size, mtime_ns) and the new hash, or None if unchanged on disk;
+            (None, None) if the file could not be read (e.g. it was deleted)
+        """
+        try:
+            st = os.stat(file_path)
+            stat_key = (st.st_size, st.st_mtime_ns)
+            # A stat entry is only ever stored next to the hash it was taken with
+            if self.file_stats.get(file_path) == stat_key:
+                return stat_key, None
+            return stat_key, self.compute_hash_from_path(file_path)
+        except OSError as e:
+            logger.warning(f"⚠️  Could not read {file_path}: {e}")
+            return None, None
+
+    def _record_hash(self, file_path: str, new_hash: bytes, now: float) -> bool:
+        """Store a freshly computed hash and return True if it differs."""
+        self._touch(file_path, now)
+        old_hash = self.file_hashes.get(file_path)
 
-    def has_changed(self, file_path: str, content: str) -> bool:
+        if old_hash != new_hash:
+            if logger.isEnabledFor(logging.DEBUG):
+                status = "NEW" if old_hash is None else "CHANGED"
+                logger.debug(
+                    "   🔍 Hash check: %s → %s (old: %s... → new: %s...)",
+                    file_path,
+                    status,
+                    old_hash[:4].hex() if old_hash else "none",
+                    new_hash[:4].hex(),
+                )
+            self._set_hash(file_path, new_hash, old_hash)
+            return True
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "   🔍 Hash check: %s → UNCHANGED (hash: %s...)",
+                file_path,
+                new_hash[:4].hex(),
+            )
+        return False
+
+    def has_changed(
+        self, file_path: str, content: Optional[Union[bytes, str]] = None
+    ) -> bool:
         """
         Check if file has changed since last index.
 
+        If content is omitted the file is read from disk, and hashing is
+        skipped entirely while its size and mtime match the last check.
+
         Returns True if:
         - File is new (not in cache)
         - File content hash has changed
+        - File can no longer be read from disk (it is dropped from tracking)
         """
         if not self.is_indexable(file_path):
-            logger.info(f"   🔍 Hash check: {file_path} (not indexable, skipping)")
+            logger.debug("   🔍 Hash check: %s (not indexable, skipping)", file_path)
             return False
 
-        new_hash = self.compute_hash(content)
-        old_hash = self.file_hashes.get(file_path)
+        now = time.time()
+        if content is None:
+            stat_key, new_hash = self._hash_from_disk(file_path)
+            if stat_key is None:
+                # Gone or unreadable: stop tracking it and let the caller re-read
+                self.remove_file(file_path)
+                return True
+            if new_hash is None:
+                self._touch(file_path, now)
+                return False
+            self.file_stats[file_path] = stat_key
+        else:
+            new_hash = self.compute_hash(content)
+            # Content may not match what is on disk, so re-hash next time
+            self.file_stats.pop(file_path, None)
+        return self._record_hash(file_path, new_hash, now)
 
-        if old_hash != new_hash:
-            status = "NEW" if old_hash is None else "CHANGED"
-            logger.info(
-                f"   🔍 Hash check: {file_path} → {status} (old: {old_hash[:8] if old_hash else 'none'}... → new: {new_hash[:8]}...)"
-            )
-            self.file_hashes[file_path] = new_hash
-            self.last_check[file_path] = time.time()
-            return True
-
-        # Update last check time even if not changed
-        logger.info(
-            f"   🔍 Hash check: {file_path} → UNCHANGED (hash: {new_hash[:8]}...)"
-        )
-        self.last_check[file_path] = time.time()
-        return False
-
-    def get_changed_files(self, files: Dict[str, str]) -> List[str]:
+    def get_changed_files(self, files: Iterable[str]) -> List[str]:
         """
         Return list of changed file paths.
 
+        Files are stat'ed and hashed in bulk, on a thread pool for larger
+        batches (hashlib releases the GIL), and the results are merged into
+        the tracker on this thread in one pass. A file that can no longer be
+        read (deleted or unreadable since it was listed) is reported as
+        changed and dropped from tracking, so the caller re-reads it.
+
         Args:
-            files: Dict of file_path: content
+            files: Paths of the files to check, hashed straight from disk
 
         Returns:
             List of file paths that have changed
         """
+        files = list(files)
         logger.info(f"🔍 Checking {len(files)} files for changes...")
+        indexable = list(filter(self.is_indexable, files))
+        if len(indexable) >= PARALLEL_HASH_MIN_FILES:
+            with ThreadPoolExecutor() as pool:
+                results = list(pool.map(self._hash_from_disk, indexable))
+        else:
+            # Not worth starting threads for a handful of files
+            results = list(map(self._hash_from_disk, indexable))
+
         changed = []
-        for path, content in files.items():
-            if self.has_changed(path, content):
+        now = time.time()
+        touch = self._touch
+        record_hash = self._record_hash
+        file_stats = self.file_stats
+        for path, (stat_key, new_hash) in zip(indexable, results):
+            if stat_key is None:
+                self.remove_file(path)
+                changed.append(path)
+                continue
+            if new_hash is None:
+                touch(path, now)
+                continue
+            file_stats[path] = stat_key
+            if record_hash(path, new_hash, now):
                 changed.append(path)
         logger.info(
             f"   ✓ Hash check complete: {len(changed)} changed, {len(files) - len(changed)} unchanged"
         )
         return changed
 
-    def mark_indexed(self, file_path: str, content: str):
+    def mark_indexed(self, file_path: str, content: Union[bytes, str]):
         """Mark a file as indexed with its current hash."""
         if self.is_indexable(file_path):
             hash_value = self.compute_hash(content)
-            self.file_hashes[file_path] = hash_value
-            self.last_check[file_path] = time.time()
-            logger.info(
-                f"   📌 Marked as indexed: {file_path} (hash: {hash_value[:8]}...)"
-            )
+            self._set_hash(file_path, hash_value, self.file_hashes.get(file_path))
+            self.file_stats.pop(file_path, None)
+            self._touch(file_path, time.time())
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "   📌 Marked as indexed: %s (hash: %s...)",
+                    file_path,
+                    hash_value[:4].hex(),
+                )
+
+    def _set_hash(self, file_path: str, new_hash: bytes, old_hash: Optional[bytes]):
+        """Store a file's digest and fold the change into the root hash."""
+        if old_hash is not None:
+            self._root_hash ^= _entry_digest(file_path, old_hash)
+        self._root_hash ^= _entry_digest(file_path, new_hash)
+        self.file_hashes[file_path] = new_hash
+
+    def compute_root(self) -> bytes:
+        """
+        Return a digest of every tracked (path, hash) pair.
+
+        Maintained incrementally, so this is O(1). Store it alongside the
+        index and compare later with fast_unchanged().
+        """
+        return self._root_hash.to_bytes(ROOT_HASH_SIZE, "big")
+
+    def fast_unchanged(self, expected_root: bytes) -> bool:
+        """Check in O(1) whether the tracked files match a prior compute_root()."""
+        return self.compute_root() == expected_root
+
+    def _touch(self, file_path: str, now: float):
+        """Record a check time, keeping the cached oldest/newest checks valid."""
+        self.last_check[file_path] = now
+        self._forget_check(file_path)
+        if self._newest_check is not None and now >= self._newest_check[0]:
+            self._newest_check = (now, file_path)
+        # Only possible if the wall clock stepped backwards
+        if self._oldest_check is not None and now < self._oldest_check[0]:
+            self._oldest_check = (now, file_path)
+
+    def _forget_check(self, file_path: str):
+        """Drop cached extremes that belonged to file_path."""
+        if self._oldest_check is not None and self._oldest_check[1] == file_path:
+            self._oldest_check = None
+        if self._newest_check is not None and self._newest_check[1] == file_path:
+            self._newest_check = None
 
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics about tracked files."""
+        oldest_check = newest_check = None
+        if self.last_check:
+            # Only rescan when the cached extreme was overwritten or removed
+            if self._oldest_check is None:
+                self._oldest_check = min(
+                    (checked, path) for path, checked in self.last_check.items()
+                )
+            if self._newest_check is None:
+                self._newest_check = max(
+                    (checked, path) for path, checked in self.last_check.items()
+                )
+            oldest_check = self._oldest_check[0]
+            newest_check = self._newest_check[0]
         return {
             "total_files": len(self.file_hashes),
-            "oldest_check": min(self.last_check.values()) if self.last_check else None,
-            "newest_check": max(self.last_check.values()) if self.last_check else None,
+            "oldest_check": oldest_check,
+            "newest_check": newest_check,
         }
 
     def remove_file(self, file_path: str):
         """Remove a file from tracking (e.g., when deleted)."""
-        self.file_hashes.pop(file_path, None)
+        old_hash = self.file_hashes.pop(file_path, None)
+        if old_hash is not None:
+            self._root_hash ^= _entry_digest(file_path, old_hash)
         self.last_check.pop(file_path, None)
+        self.file_stats.pop(file_path, None)
+        self._forget_check(file_path)
 
     def clear(self):
         """Clear all tracked files."""
         self.file_hashes.clear()
+        self._root_hash = 0
         self.last_check.clear()
+        self.file_stats.clear()
+        self._oldest_check = self._newest_check = None
+
+    def save(self, path: Path):
+        """Write tracker state to disk so the next run starts incremental."""
+        path = Path(path)
+        state = {
+            "version": STATE_VERSION,
+            "file_hashes": {
+                file_path: digest.hex()
+                for file_path, digest in self.file_hashes.items()
+            },
+            "last_check": self.last_check,
+            "file_stats": self.file_stats,
+        }
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps(state, separators=(",", ":")))
+        # Atomic swap so a crash mid-write never leaves a truncated state file
+        os.replace(tmp_path, path)
+        logger.info(f"💾 Saved hash state for {len(self.file_hashes)} files to {path}")
+
+    @classmethod
+    def load(
+        cls, path: Path, extra_extensions: Iterable[str] = ()
+    ) -> "FileHashTracker":
+        """
+        Create a tracker from state written by save().
+
+        Returns an empty tracker if the file is missing, unreadable, malformed
+        or was written by an incompatible version.
+        """
+        tracker = cls(extra_extensions)
+        try:
+            state = json.loads(Path(path).read_text())
+            if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+                logger.info(
+                    f"🔄 Hash state {path} is from another version, starting fresh"
+                )
+                return tracker
+
+            # Parse every field before touching the tracker, so a bad entry
+            # can't leave it half loaded
+            file_hashes = {
+                file_path: bytes.fromhex(digest)
+                for file_path, digest in state["file_hashes"].items()
+            }
+            last_check = {
+                file_path: float(checked)
+                for file_path, checked in state["last_check"].items()
+            }
+            file_stats = {}
+            for file_path, (size, mtime_ns) in state["file_stats"].items():
+                file_stats[file_path] = (int(size), int(mtime_ns))
+        except FileNotFoundError:
+            return tracker
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"⚠️  Ignoring unreadable hash state {path}: {e}")
+            return tracker
+
+        for file_path, digest in file_hashes.items():
+            tracker._set_hash(file_path, digest, None)
+        tracker.last_check = last_check
+        tracker.file_stats = file_stats
+        logger.info(
+            f"📂 Loaded hash state for {len(tracker.file_hashes)} files from {path}"
+        )
+        return tracker
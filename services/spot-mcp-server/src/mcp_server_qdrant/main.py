@@ -19,6 +19,11 @@ def main():
 
     # Import is done here to make sure environment variables are loaded
     # only after we make the changes.
-    from mcp_server_qdrant.server import mcp
+    from mcp_server_qdrant.server import configure_logging, get_mcp
 
-    mcp.run(transport=args.transport)
+    configure_logging()
+    mcp = get_mcp()
+    try:
+        mcp.run(transport=args.transport)
+    finally:
+        mcp.embedding_provider.close()
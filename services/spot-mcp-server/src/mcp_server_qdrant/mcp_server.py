@@ -1,7 +1,16 @@
+import ast
+import datetime
 import json
 import logging
+import re
+import time
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from itertools import chain, islice
 from typing import Annotated, Any
 
+import numpy as np
 from fastmcp import Context, FastMCP
 from mcp_server_qdrant.common.filters import make_indexes
 from mcp_server_qdrant.common.func_tools import make_partial_function
@@ -19,40 +28,183 @@ from qdrant_client import models
 
 logger = logging.getLogger(__name__)
 
+# Reused encoder: same output as json.dumps without its per-call argument handling
+_encode_json = json.JSONEncoder().encode
+_format_entry = "<entry><content>{}</content><metadata>{}</metadata></entry>".format
 
-# Add normalization function at the top-level (after imports)
-def normalize_metadata(metadata):
-    import ast
-    import datetime
+# Stored "type" for each category; unknown categories are stored as "memory"
+_CATEGORY_TYPES = {
+    "decision": "architectural_decision",
+    "pattern": "coding_pattern",
+    "memory": "memory",
+}
+
+# Categories grouped separately in search results; anything else is "other"
+_SEARCH_CATEGORIES = frozenset(("codebase", "decision", "pattern", "memory"))
+
+# Fixed search queries behind the project overview and component inventory
+_OVERVIEW_QUERY = "file imports classes functions"
+_INVENTORY_QUERY = "classes functions methods"
+# The only metadata they read, so the (large) content isn't fetched
+_OVERVIEW_FIELDS = ["category", "language", "file_path", "chunk_type", "name"]
+_INVENTORY_FIELDS = ["category", "chunk_type", "name", "file_path", "parent_class"]
+
+# Special get_smart_context topics, matched in one scan each
+_OVERVIEW_QUERY_SEARCH = re.compile(r"project (?:overview|summary|structure)").search
+_INVENTORY_QUERY_SEARCH = re.compile(r"list (?:classes|functions|components)").search
+
+# Unix timestamps datetime can represent: from year 1 up to (not including) 10000
+_MIN_TIMESTAMP = -62135596800.0
+_MAX_TIMESTAMP = 253402300800.0
+
+# Code preview lines: not blank and not starting with "#"
+_CODE_LINE_FINDITER = re.compile(r"^(?!#).*\S.*$", re.MULTILINE).finditer
+
+# Workspace name normalization
+_WS_NONWORD_SUB = re.compile(r"[^\w\-]").sub
+_WS_DASHES_SUB = re.compile(r"-+").sub
+
+
+@lru_cache(maxsize=512)
+def _normalize_ws(name: str) -> str:
+    """Normalize a workspace name; cached since the same few names recur."""
+    normalized = name.lower()
+    normalized = _WS_NONWORD_SUB("-", normalized)  # Replace non-alphanumeric with -
+    normalized = _WS_DASHES_SUB("-", normalized)  # Collapse multiple hyphens
+    return normalized.strip("-")  # Remove leading/trailing hyphens
+
+
+@lru_cache(maxsize=256)
+def _iso_to_unix(value: str) -> float | None:
+    """Convert an ISO timestamp (trailing 'Z' allowed) to Unix time, None if invalid."""
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"  # fromisoformat doesn't accept 'Z' before 3.11
+    try:
+        return datetime.datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
+def _unix_to_iso(timestamps: list) -> list[str]:
+    """
+    Format stored Unix timestamps as UTC ISO for display, "unknown" for invalid ones.
+
+    Converts all of them in one NumPy pass, with the same output (and microsecond
+    rounding) as datetime.fromtimestamp(ts, tz=timezone.utc).isoformat().
+    """
+    ts = np.array(
+        [t if isinstance(t, (int, float)) else np.nan for t in timestamps],
+        dtype=np.float64,
+    )
+    valid = np.isfinite(ts) & (ts >= _MIN_TIMESTAMP) & (ts < _MAX_TIMESTAMP)
+    frac, whole = np.modf(np.where(valid, ts, 0.0))
+    micros = whole.astype(np.int64) * 1_000_000 + np.round(frac * 1e6).astype(np.int64)
+    iso = micros.astype("datetime64[us]").astype(str).tolist()
+    return [
+        text.removesuffix(".000000") + "+00:00" if ok else "unknown"
+        for text, ok in zip(iso, valid.tolist())
+    ]
+
+
+def _tags_condition(tags: str) -> models.FieldCondition | None:
+    """
+    Match entries having any of the comma-separated tags, using the keyword-indexed
+    tag_list that store writes. None if there are no tags.
+    """
+    tag_list = [t for t in map(str.strip, tags.split(",")) if t]
+    if not tag_list:
+        return None
+    return models.FieldCondition(
+        key="metadata.tag_list", match=models.MatchAny(any=tag_list)
+    )
+
+
+def _category_condition(categories: list[str]) -> models.FieldCondition:
+    """Match entries in any of the categories (a single category is matched exactly)."""
+    if len(categories) == 1:
+        return models.FieldCondition(
+            key="metadata.category", match=models.MatchValue(value=categories[0])
+        )
+    return models.FieldCondition(
+        key="metadata.category", match=models.MatchAny(any=categories)
+    )
 
-    def add_timestamp(md):
-        md = dict(md) if md is not None else {}
-        now = datetime.datetime.now(datetime.timezone.utc)
-        md["timestamp"] = now.timestamp()  # Unix timestamp (numeric for range queries)
-        return md
 
+def _other_workspace_code_filter(workspace: str) -> models.Filter:
+    """Match codebase entries that don't belong to the workspace (for must_not)."""
+    return models.Filter(
+        must=[
+            models.FieldCondition(
+                key="metadata.category", match=models.MatchValue(value="codebase")
+            )
+        ],
+        must_not=[
+            models.FieldCondition(
+                key="metadata.workspace", match=models.MatchValue(value=workspace)
+            )
+        ],
+    )
+
+
+def _add_timestamp(md):
+    md = dict(md) if md is not None else {}
+    md["timestamp"] = time.time()  # Unix timestamp (numeric for range queries)
+    return md
+
+
+def _reject_constant(name):
+    raise ValueError(f"{name} is not a Python literal")
+
+
+def _loads_python_literal(text: str):
+    """
+    Parse a single-quoted dict/list literal.
+
+    Swapping the quotes and parsing as JSON is much faster than ast.literal_eval,
+    but only safe when the text has no double quotes or escapes to change meaning.
+    """
+    if '"' not in text and "\\" not in text:
+        try:
+            return json.loads(text.replace("'", '"'), parse_constant=_reject_constant)
+        except ValueError:
+            pass
+    return ast.literal_eval(text)
+
+
+# Add normalization function at the top-level (after imports)
+def normalize_metadata(metadata):
     if metadata is None:
-        return add_timestamp({})
+        return _add_timestamp({})
     if isinstance(metadata, dict):
-        return add_timestamp(metadata)
+        return _add_timestamp(metadata)
     if isinstance(metadata, str):
         try:
             parsed = json.loads(metadata)
             if isinstance(parsed, dict):
-                return add_timestamp(parsed)
+                return _add_timestamp(parsed)
             else:
-                return add_timestamp({"value": parsed})
+                return _add_timestamp({"value": parsed})
         except Exception:
-            # Try ast.literal_eval for single-quoted dict/list
-            try:
-                parsed = ast.literal_eval(metadata)
-                if isinstance(parsed, dict) or isinstance(parsed, list):
-                    return add_timestamp(parsed)
-                else:
-                    return add_timestamp({"value": parsed})
-            except Exception:
-                return add_timestamp({"value": metadata})
-    return add_timestamp({"value": metadata})
+            pass
+        # Try single-quoted dict/list
+        try:
+            parsed = _loads_python_literal(metadata)
+            if isinstance(parsed, dict) or isinstance(parsed, list):
+                return _add_timestamp(parsed)
+            else:
+                return _add_timestamp({"value": parsed})
+        except Exception:
+            return _add_timestamp({"value": metadata})
+    return _add_timestamp({"value": metadata})
+
+
+@asynccontextmanager
+async def _close_connector_on_shutdown(server: "QdrantMCPServer"):
+    """Stop the connector's background store writer when the server shuts down."""
+    try:
+        yield {}
+    finally:
+        await server.qdrant_connector.close()
 
 
 # FastMCP is an alternative interface for declaring the capabilities
@@ -94,10 +246,18 @@ class QdrantMCPServer(FastMCP):
             make_indexes(qdrant_settings.filterable_fields_dict()),
             reranker=self.reranker,
         )
+        self.qdrant_connector.pin_query_embeddings(_OVERVIEW_QUERY, _INVENTORY_QUERY)
+
+        # Workspace conditions are built once per workspace; callers get a fresh
+        # Filter around them, so changing one can't leak into later queries
+        self._workspace_conditions: dict[str, models.FieldCondition] = {}
 
         logger.info("📊 Spot memory server: bge-large-en-v1.5 + reranking")
         self.auto_index_enabled = True
+        # Workspace whose code is searched; None searches code from all workspaces
+        self.current_workspace: str | None = None
 
+        settings.setdefault("lifespan", _close_connector_on_shutdown)
         super().__init__(name=name, instructions=instructions, **settings)
 
         self.setup_tools()
@@ -109,14 +269,7 @@ class QdrantMCPServer(FastMCP):
         - Replace spaces and special chars with hyphens
         - Remove leading/trailing hyphens
         """
-        import re
-
-        normalized = name.lower()
-        normalized = re.sub(
-            r"[^\w\-]", "-", normalized
-        )  # Replace non-alphanumeric with -
-        normalized = re.sub(r"-+", "-", normalized)  # Collapse multiple hyphens
-        normalized = normalized.strip("-")  # Remove leading/trailing hyphens
+        normalized = _normalize_ws(name)
 
         if normalized != name:
             logger.info(f"Normalized workspace name: '{name}' -> '{normalized}'")
@@ -140,35 +293,35 @@ class QdrantMCPServer(FastMCP):
 
     def _add_workspace_filter(
         self, existing_filter: models.Filter | None = None
-    ) -> models.Filter:
+    ) -> models.Filter | None:
         """Add workspace filter to existing filter conditions."""
         if not self.current_workspace:
-            # No workspace set, return existing filter or no filter
-            return existing_filter or models.Filter(must=[])
-
-        workspace_condition = models.FieldCondition(
-            key="metadata.workspace",
-            match=models.MatchValue(value=self.current_workspace),
-        )
+            # No workspace set, return existing filter (None means no filter)
+            return existing_filter
+
+        workspace_condition = self._workspace_conditions.get(self.current_workspace)
+        if workspace_condition is None:
+            workspace_condition = models.FieldCondition(
+                key="metadata.workspace",
+                match=models.MatchValue(value=self.current_workspace),
+            )
+            self._workspace_conditions[self.current_workspace] = workspace_condition
 
         if existing_filter is None:
             return models.Filter(must=[workspace_condition])
 
-        # Merge with existing filter
+        # Merge with existing filter; the conditions are already validated
         must_conditions = list(existing_filter.must or [])
         must_conditions.append(workspace_condition)
-        return models.Filter(
-            must=must_conditions,
-            should=existing_filter.should,
-            must_not=existing_filter.must_not,
-        )
+        return existing_filter.model_copy(update={"must": must_conditions})
 
     def format_entry(self, entry: Entry) -> str:
         """
         Feel free to override this method in your subclass to customize the format of the entry.
         """
-        entry_metadata = json.dumps(entry.metadata) if entry.metadata else ""
-        return f"<entry><content>{entry.content}</content><metadata>{entry_metadata}</metadata></entry>"
+        return _format_entry(
+            entry.content, _encode_json(entry.metadata) if entry.metadata else ""
+        )
 
     def setup_tools(self):
         """
@@ -230,19 +383,13 @@ class QdrantMCPServer(FastMCP):
                 store_metadata.update(metadata)
             elif isinstance(metadata, str):
                 try:
-                    import json
-
                     store_metadata.update(json.loads(metadata))
                 except (json.JSONDecodeError, TypeError, ValueError):
                     pass
 
             # Set category-specific metadata
             store_metadata["category"] = cat
-            store_metadata["type"] = {
-                "decision": "architectural_decision",
-                "pattern": "coding_pattern",
-                "memory": "memory",
-            }.get(cat, "memory")
+            store_metadata["type"] = _CATEGORY_TYPES.get(cat, "memory")
 
             if tags:
                 store_metadata["tags"] = tags
@@ -303,7 +450,7 @@ class QdrantMCPServer(FastMCP):
             tags: Annotated[
                 str | None,
                 Field(
-                    description="Filter by tags (comma-separated, e.g., 'async,api')"
+                    description="Filter by tags (comma-separated, e.g., 'async,api'); matches entries with any of the tags"
                 ),
             ] = None,
             since: Annotated[
@@ -326,9 +473,12 @@ class QdrantMCPServer(FastMCP):
             Returns mixed results with optional filters for workspace, category, language, tags, and time.
             """
             target_collection = collection_name or self.qdrant_settings.collection_name
+            since_unix = _iso_to_unix(since) if since else None
+            until_unix = _iso_to_unix(until) if until else None
 
             # Build filter conditions
             conditions = []
+            must_not = []
 
             # Category filter
             if category:
@@ -347,9 +497,13 @@ class QdrantMCPServer(FastMCP):
                         )
                     )
             elif workspace_name:
-                # If no category but workspace specified, filter codebase results by workspace
-                # We'll do this in post-processing for mixed results
-                target_workspace = self._normalize_workspace_name(workspace_name)
+                # If no category but workspace specified, leave out codebase results
+                # from other workspaces; non-codebase entries are global
+                must_not.append(
+                    _other_workspace_code_filter(
+                        self._normalize_workspace_name(workspace_name)
+                    )
+                )
 
             # Language filter
             if language:
@@ -359,65 +513,39 @@ class QdrantMCPServer(FastMCP):
                     )
                 )
 
-            # Tags filter
-            if tags:
-                tag_list = [t.strip() for t in tags.split(",")]
-                for tag in tag_list:
-                    conditions.append(
-                        models.FieldCondition(
-                            key="metadata.tags", match=models.MatchText(text=tag)
-                        )
-                    )
-
-            # Time filters
-            if since or until:
-                import datetime
+            # Tags filter: one condition matching any of the tags
+            if tags and (tags_condition := _tags_condition(tags)):
+                conditions.append(tags_condition)
 
-                if since:
-                    try:
-                        since_dt = datetime.datetime.fromisoformat(
-                            since.replace("Z", "+00:00")
-                        )
-                        since_unix = since_dt.timestamp()
-                        conditions.append(
-                            models.FieldCondition(
-                                key="metadata.timestamp",
-                                range=models.Range(gte=since_unix),
-                            )
-                        )
-                    except ValueError:
-                        pass
-                if until:
-                    try:
-                        until_dt = datetime.datetime.fromisoformat(
-                            until.replace("Z", "+00:00")
-                        )
-                        until_unix = until_dt.timestamp()
-                        conditions.append(
-                            models.FieldCondition(
-                                key="metadata.timestamp",
-                                range=models.Range(lte=until_unix),
-                            )
-                        )
-                    except ValueError:
-                        pass
+            # Time filters (invalid timestamps are ignored)
+            if since_unix is not None:
+                conditions.append(
+                    models.FieldCondition(
+                        key="metadata.timestamp", range=models.Range(gte=since_unix)
+                    )
+                )
+            if until_unix is not None:
+                conditions.append(
+                    models.FieldCondition(
+                        key="metadata.timestamp", range=models.Range(lte=until_unix)
+                    )
+                )
 
-            # Merge with arbitrary filter if provided
+            # Merge with arbitrary filter if provided, validating the Filter only once
             if query_filter:
+                query_filter = dict(query_filter)
+                for clause, extra in (("must", conditions), ("must_not", must_not)):
+                    if extra:
+                        existing = query_filter.get(clause) or []
+                        if not isinstance(existing, list):
+                            existing = [existing]  # a single condition is allowed too
+                        query_filter[clause] = existing + extra
                 query_filter_obj = models.Filter(**query_filter)
-                if conditions:
-                    # Merge conditions
-                    must_conditions = list(query_filter_obj.must or []) + conditions
-                    query_filter_obj = models.Filter(
-                        must=must_conditions,
-                        should=query_filter_obj.should,
-                        must_not=query_filter_obj.must_not,
-                    )
-                else:
-                    query_filter_obj = query_filter_obj
             else:
                 query_filter_obj = (
-                    models.Filter(must=conditions) if conditions else None
+                    models.Filter(must=conditions or None, must_not=must_not or None)
+                    if conditions or must_not
+                    else None
                 )
 
             await ctx.debug(
@@ -431,22 +559,6 @@ class QdrantMCPServer(FastMCP):
                 query_filter=query_filter_obj,
             )
 
-            # Post-process: if workspace specified but no category, filter codebase results
-            if workspace_name and not category:
-                target_workspace = self._normalize_workspace_name(workspace_name)
-                filtered_entries = []
-                for entry in entries:
-                    meta = entry.metadata or {}
-                    entry_category = meta.get("category", "other")
-                    if entry_category == "codebase":
-                        entry_workspace = meta.get("workspace", "")
-                        if entry_workspace == target_workspace:
-                            filtered_entries.append(entry)
-                    else:
-                        # Non-codebase entries are global, include them
-                        filtered_entries.append(entry)
-                entries = filtered_entries
-
             if not entries:
                 filter_desc = []
                 if category:
@@ -457,33 +569,28 @@ class QdrantMCPServer(FastMCP):
                 return [f"No results found for '{query}'{filter_str}"]
 
             # Group results by category for better presentation
-            by_category = {
-                "codebase": [],
-                "decision": [],
-                "pattern": [],
-                "memory": [],
-                "other": [],
-            }
+            by_category = defaultdict(list)
             for entry in entries:
-                meta = entry.metadata or {}
-                cat = meta.get("category", "other")
-                by_category.get(cat, by_category["other"]).append(entry)
+                cat = (entry.metadata or {}).get("category", "other")
+                by_category[cat if cat in _SEARCH_CATEGORIES else "other"].append(entry)
 
             content = [f"Found {len(entries)} results for '{query}':\n"]
 
             # Show decisions first
             if by_category["decision"]:
                 content.append(f"\n📋 Decisions ({len(by_category['decision'])}):")
-                for entry in by_category["decision"][:5]:
-                    preview = entry.content[:150] if entry.content else "[empty]"
-                    content.append(f"  • {preview}...")
+                content.extend(
+                    f"  • {entry.content[:150] if entry.content else '[empty]'}..."
+                    for entry in by_category["decision"][:5]
+                )
 
             # Then patterns
             if by_category["pattern"]:
                 content.append(f"\n🎨 Patterns ({len(by_category['pattern'])}):")
-                for entry in by_category["pattern"][:5]:
-                    preview = entry.content[:150] if entry.content else "[empty]"
-                    content.append(f"  • {preview}...")
+                content.extend(
+                    f"  • {entry.content[:150] if entry.content else '[empty]'}..."
+                    for entry in by_category["pattern"][:5]
+                )
 
             # Then codebase
             if by_category["codebase"]:
@@ -505,8 +612,12 @@ class QdrantMCPServer(FastMCP):
                 content.append(
                     f"\n📝 Other ({len(by_category['memory']) + len(by_category['other'])}):"
                 )
-                for entry in (by_category["memory"] + by_category["other"])[:5]:
-                    content.append(f"  • {entry.content[:150]}...")
+                content.extend(
+                    f"  • {entry.content[:150]}..."
+                    for entry in islice(
+                        chain(by_category["memory"], by_category["other"]), 5
+                    )
+                )
 
             return content
 
@@ -545,30 +656,21 @@ class QdrantMCPServer(FastMCP):
         async def list_workspaces(ctx: Context) -> str:
             """List all workspaces that have stored memories."""
             try:
-                # Query for all unique workspace names in memories
-                entries = await self.qdrant_connector.search(
-                    "any content",  # Broad search to find all entries
-                    limit=1000,  # Get many results to find all workspaces
+                # Scroll just the workspace_name field instead of running a search
+                workspaces = await self.qdrant_connector.get_metadata_values(
+                    "workspace_name",
                     collection_name=self.qdrant_settings.collection_name,
                 )
 
-                workspaces = set()
-                for entry in entries:
-                    meta = entry.metadata or {}
-                    workspace = meta.get("workspace_name")
-                    if workspace:
-                        workspaces.add(workspace)
-
                 if not workspaces:
                     return "No workspaces with stored memories found."
 
-                result = (
+                header = (
                     f"📁 **Workspaces with memories:** ({len(workspaces)} total)\n\n"
                 )
-                for workspace in sorted(workspaces):
-                    result += f"• {workspace}\n"
-
-                return result
+                return header + "".join(
+                    f"• {workspace}\n" for workspace in sorted(workspaces)
+                )
 
             except Exception as e:
                 logger.error(f"Failed to list workspaces: {e}")
@@ -622,15 +724,9 @@ class QdrantMCPServer(FastMCP):
 
             # Check for special queries
             topic_lower = topic.lower()
-            if any(
-                x in topic_lower
-                for x in ["project overview", "project summary", "project structure"]
-            ):
+            if _OVERVIEW_QUERY_SEARCH(topic_lower):
                 return await self._get_project_overview(target_collection)
-            elif any(
-                x in topic_lower
-                for x in ["list classes", "list functions", "list components"]
-            ):
+            elif _INVENTORY_QUERY_SEARCH(topic_lower):
                 return await self._get_component_inventory(
                     target_collection, topic_lower
                 )
@@ -650,17 +746,6 @@ class QdrantMCPServer(FastMCP):
             )
             codebase_filter = self._add_workspace_filter(codebase_filter)
 
-            codebase_entries = (
-                await self.qdrant_connector.search(
-                    topic,
-                    collection_name=target_collection,
-                    limit=max_results,
-                    query_filter=codebase_filter,
-                )
-                if include_code
-                else []
-            )
-
             # Search for decisions and patterns (no workspace filter needed)
             other_filter = models.Filter(
                 should=[
@@ -675,12 +760,24 @@ class QdrantMCPServer(FastMCP):
                 ]
             )
 
-            other_entries = await self.qdrant_connector.search(
-                topic,
-                collection_name=target_collection,
-                limit=max_results,
-                query_filter=other_filter,
-            )
+            # One embedding and one round-trip for both searches
+            if include_code:
+                codebase_entries, other_entries = (
+                    await self.qdrant_connector.search_batch(
+                        topic,
+                        [codebase_filter, other_filter],
+                        collection_name=target_collection,
+                        limit=max_results,
+                    )
+                )
+            else:
+                codebase_entries = []
+                other_entries = await self.qdrant_connector.search(
+                    topic,
+                    collection_name=target_collection,
+                    limit=max_results,
+                    query_filter=other_filter,
+                )
 
             if not codebase_entries and not other_entries:
                 return f"No context found for: {topic}"
@@ -709,23 +806,25 @@ class QdrantMCPServer(FastMCP):
 
             if decisions:
                 result.append(f"\n📋 Related Decisions ({len(decisions)}):")
-                for entry in decisions[:5]:
-                    meta = entry.metadata or {}
-                    decision = meta.get("decision", "")
-                    if decision:
-                        result.append(f"- {decision}")
-                    else:
-                        result.append(f"- {entry.content[:200]}...")
+                result.extend(
+                    (
+                        f"- {decision}"
+                        if (decision := (entry.metadata or {}).get("decision"))
+                        else f"- {entry.content[:200]}..."
+                    )
+                    for entry in decisions[:5]
+                )
 
             if patterns:
                 result.append(f"\n🎨 Related Patterns ({len(patterns)}):")
-                for entry in patterns[:5]:
-                    meta = entry.metadata or {}
-                    pattern = meta.get("pattern", "")
-                    if pattern:
-                        result.append(f"- {pattern}")
-                    else:
-                        result.append(f"- {entry.content[:200]}...")
+                result.extend(
+                    (
+                        f"- {pattern}"
+                        if (pattern := (entry.metadata or {}).get("pattern"))
+                        else f"- {entry.content[:200]}..."
+                    )
+                    for entry in patterns[:5]
+                )
 
             if codebase:
                 result.append(f"\n💻 Related Code ({len(codebase)}):")
@@ -746,23 +845,19 @@ class QdrantMCPServer(FastMCP):
 
                     # Include code snippet if requested
                     if include_code and name:
-                        code_lines = entry.content.split("\n")
-                        # Show first 5 lines of actual code
-                        code_preview = []
-                        for line in code_lines:
-                            if line.strip() and not line.startswith("#"):
-                                code_preview.append(line)
-                                if len(code_preview) >= 5:
-                                    break
+                        # Show the first 3 lines of actual code
+                        code_preview = [
+                            match.group()
+                            for match in islice(_CODE_LINE_FINDITER(entry.content), 3)
+                        ]
                         if code_preview:
                             result.append(
-                                f"  ```\n  {chr(10).join(code_preview[:3])}\n  ...```"
+                                f"  ```\n  {chr(10).join(code_preview)}\n  ...```"
                             )
 
             if other:
                 result.append(f"\n📝 Other Context ({len(other)}):")
-                for entry in other[:5]:
-                    result.append(f"- {entry.content[:200]}...")
+                result.extend(f"- {entry.content[:200]}..." for entry in other[:5])
 
             return "\n".join(result)
 
@@ -784,9 +879,9 @@ class QdrantMCPServer(FastMCP):
                 Field(description="ISO timestamp to search until"),
             ] = None,
             category: Annotated[
-                str | None,
+                str | list[str] | None,
                 Field(
-                    description="Filter by category (decision, pattern, codebase, memory)"
+                    description="Filter by category (decision, pattern, codebase, memory), or a list of categories to match any of"
                 ),
             ] = None,
             collection_name: Annotated[
@@ -801,56 +896,55 @@ class QdrantMCPServer(FastMCP):
             target_collection = collection_name or self.qdrant_settings.collection_name
 
             # Build filter conditions
-            from qdrant_client import models
-
             conditions = []
 
             # Convert ISO timestamps to Unix timestamps for range queries
-            import datetime
-
-            if since:
-                try:
-                    since_dt = datetime.datetime.fromisoformat(
-                        since.replace("Z", "+00:00")
-                    )
-                    since_unix = since_dt.timestamp()
-                    conditions.append(
-                        models.FieldCondition(
-                            key="metadata.timestamp", range=models.Range(gte=since_unix)
-                        )
-                    )
-                except ValueError:
-                    # If not valid ISO, skip this filter
-                    pass
-
-            if until:
-                try:
-                    until_dt = datetime.datetime.fromisoformat(
-                        until.replace("Z", "+00:00")
-                    )
-                    until_unix = until_dt.timestamp()
-                    conditions.append(
-                        models.FieldCondition(
-                            key="metadata.timestamp", range=models.Range(lte=until_unix)
-                        )
+            # (if not valid ISO, skip that filter)
+            since_unix = _iso_to_unix(since) if since else None
+            if since_unix is not None:
+                conditions.append(
+                    models.FieldCondition(
+                        key="metadata.timestamp", range=models.Range(gte=since_unix)
                     )
-                except ValueError:
-                    # If not valid ISO, skip this filter
-                    pass
+                )
 
-            if category:
+            until_unix = _iso_to_unix(until) if until else None
+            if until_unix is not None:
                 conditions.append(
                     models.FieldCondition(
-                        key="metadata.category", match=models.MatchValue(value=category)
+                        key="metadata.timestamp", range=models.Range(lte=until_unix)
                     )
                 )
+
+            # Several categories are matched in one query
+            categories = [
+                c
+                for c in ([category] if isinstance(category, str) else category or [])
+                if c
+            ]
+            if categories:
+                conditions.append(_category_condition(categories))
                 # If filtering by codebase category, add workspace filter
-                if category == "codebase":
+                if categories == ["codebase"]:
                     workspace_filter = self._add_workspace_filter()
                     if workspace_filter and workspace_filter.must:
                         conditions.extend(workspace_filter.must)
 
-            query_filter = models.Filter(must=conditions) if conditions else None
+            # Otherwise skip codebase entries from other workspaces in the query
+            # itself, so they don't take up slots in the results
+            must_not = []
+            if (
+                self.current_workspace
+                and categories != ["codebase"]
+                and (not categories or "codebase" in categories)
+            ):
+                must_not.append(_other_workspace_code_filter(self.current_workspace))
+
+            query_filter = (
+                models.Filter(must=conditions or None, must_not=must_not or None)
+                if conditions or must_not
+                else None
+            )
 
             entries = await self.qdrant_connector.search(
                 query,
@@ -859,22 +953,6 @@ class QdrantMCPServer(FastMCP):
                 query_filter=query_filter,
             )
 
-            # If no category specified, filter codebase results by workspace in post-processing
-            if not category:
-                filtered_entries = []
-                for entry in entries:
-                    meta = entry.metadata or {}
-                    entry_category = meta.get("category", "other")
-                    if entry_category == "codebase":
-                        entry_workspace = meta.get("workspace")
-                        if (
-                            self.current_workspace
-                            and entry_workspace != self.current_workspace
-                        ):
-                            continue  # Skip codebase entries from other workspaces
-                    filtered_entries.append(entry)
-                entries = filtered_entries
-
             if not entries:
                 time_desc = ""
                 if since and until:
@@ -887,31 +965,25 @@ class QdrantMCPServer(FastMCP):
                 return [f"No results found for '{query}'{time_desc}"]
 
             content = [f"Results for '{query}'"]
-            if since or until or category:
+            if since or until or categories:
                 filters = []
                 if since:
                     filters.append(f"since {since}")
                 if until:
                     filters.append(f"until {until}")
-                if category:
-                    filters.append(f"category={category}")
+                if categories:
+                    filters.append(f"category={','.join(categories)}")
                 content[0] += f" ({', '.join(filters)})"
 
-            for entry in entries:
-                meta = entry.metadata or {}
-                # Convert Unix timestamp to ISO for display
-                timestamp_display = "unknown"
-                if "timestamp" in meta:
-                    try:
-                        timestamp_unix = meta["timestamp"]
-                        dt = datetime.datetime.fromtimestamp(
-                            timestamp_unix, tz=datetime.timezone.utc
-                        )
-                        timestamp_display = dt.isoformat()
-                    except Exception:
-                        timestamp_display = "unknown"
-
-                content.append(f"[{timestamp_display}] {self.format_entry(entry)}")
+            # Unix timestamps are shown as ISO ("unknown" if missing or invalid)
+            timestamps = _unix_to_iso(
+                [(entry.metadata or {}).get("timestamp") for entry in entries]
+            )
+            format_entry = self.format_entry
+            content.extend(
+                f"[{timestamp}] {format_entry(entry)}"
+                for timestamp, entry in zip(timestamps, entries)
+            )
 
             return content
 
@@ -966,15 +1038,9 @@ class QdrantMCPServer(FastMCP):
                     )
                 )
 
-            if tags:
+            if tags and (tags_condition := _tags_condition(tags)):
                 # Search for any of the provided tags
-                tag_list = [t.strip() for t in tags.split(",")]
-                for tag in tag_list:
-                    conditions.append(
-                        models.FieldCondition(
-                            key="metadata.tags", match=models.MatchText(text=tag)
-                        )
-                    )
+                conditions.append(tags_condition)
 
             if project:
                 conditions.append(
@@ -1036,9 +1102,7 @@ class QdrantMCPServer(FastMCP):
                 if example:
                     example_lines = example.split("\n")[:3]  # First 3 lines only
                     results.append(f"  Example: {example_lines[0]}")
-                    if len(example_lines) > 1:
-                        for line in example_lines[1:]:
-                            results.append(f"           {line}")
+                    results.extend(f"           {line}" for line in example_lines[1:])
 
                 results.append("")  # Blank line
 
@@ -1050,17 +1114,18 @@ class QdrantMCPServer(FastMCP):
         workspace_filter = self._add_workspace_filter()
 
         entries = await self.qdrant_connector.search(
-            "file imports classes functions",
+            _OVERVIEW_QUERY,
             collection_name=collection_name,
             limit=100,
             query_filter=workspace_filter,
+            metadata_fields=_OVERVIEW_FIELDS,
         )
 
         if not entries:
             return "No code patterns stored yet. Use spot-store() to save code patterns and examples as memories."
 
         # Aggregate project stats
-        languages = {}
+        languages = Counter()
         files = set()
         classes = []
         functions = []
@@ -1070,8 +1135,7 @@ class QdrantMCPServer(FastMCP):
             if meta.get("category") != "codebase":
                 continue
 
-            lang = meta.get("language", "unknown")
-            languages[lang] = languages.get(lang, 0) + 1
+            languages[meta.get("language", "unknown")] += 1
 
             file_path = meta.get("file_path")
             if file_path:
@@ -1084,18 +1148,17 @@ class QdrantMCPServer(FastMCP):
             elif chunk_type in ["function", "method"] and name:
                 functions.append(name)
 
-        result = ["📊 Project Overview\n"]
-        result.append(f"Total Files: {len(files)}")
-        result.append(
-            f"Languages: {', '.join(f'{k} ({v})' for k, v in sorted(languages.items(), key=lambda x: -x[1]))}"
-        )
-        result.append(f"Classes: {len(classes)}")
-        result.append(f"Functions/Methods: {len(functions)}")
+        result = [
+            "📊 Project Overview\n",
+            f"Total Files: {len(files)}",
+            f"Languages: {', '.join(f'{k} ({v})' for k, v in sorted(languages.items(), key=lambda x: -x[1]))}",
+            f"Classes: {len(classes)}",
+            f"Functions/Methods: {len(functions)}",
+        ]
 
         if classes:
             result.append(f"\nKey Classes ({min(10, len(classes))}):")
-            for cls in sorted(classes)[:10]:
-                result.append(f"- {cls}")
+            result.extend(f"- {cls}" for cls in sorted(classes)[:10])
 
         return "\n".join(result)
 
@@ -1110,17 +1173,20 @@ class QdrantMCPServer(FastMCP):
         workspace_filter = self._add_workspace_filter()
 
         entries = await self.qdrant_connector.search(
-            "classes functions methods",
+            _INVENTORY_QUERY,
             collection_name=collection_name,
             limit=200,
             query_filter=workspace_filter,
+            metadata_fields=_INVENTORY_FIELDS,
         )
 
         if not entries:
             return "No codebase indexed yet."
 
-        classes = []
-        functions = []
+        # Deduplicated as collected; the counts include repeated chunks
+        classes: set[str] = set()
+        functions: set[str] = set()
+        class_count = function_count = 0
 
         for entry in entries:
             meta = entry.metadata or {}
@@ -1132,26 +1198,26 @@ class QdrantMCPServer(FastMCP):
             file_path = meta.get("file_path", "")
 
             if chunk_type == "class" and name:
-                classes.append(f"{file_path}::{name}")
+                classes.add(f"{file_path}::{name}")
+                class_count += 1
             elif chunk_type in ["function", "method"] and name:
                 parent = meta.get("parent_class", "")
                 if parent:
-                    functions.append(f"{file_path}::{parent}.{name}")
+                    functions.add(f"{file_path}::{parent}.{name}")
                 else:
-                    functions.append(f"{file_path}::{name}")
+                    functions.add(f"{file_path}::{name}")
+                function_count += 1
 
         result = []
 
         if list_all or list_classes:
-            result.append(f"Classes ({len(classes)}):")
-            for cls in sorted(set(classes))[:50]:
-                result.append(f"- {cls}")
+            result.append(f"Classes ({class_count}):")
+            result.extend(f"- {cls}" for cls in sorted(classes)[:50])
 
         if list_all or list_functions:
             if result:
                 result.append("")
-            result.append(f"Functions/Methods ({len(functions)}):")
-            for func in sorted(set(functions))[:50]:
-                result.append(f"- {func}")
+            result.append(f"Functions/Methods ({function_count}):")
+            result.extend(f"- {func}" for func in sorted(functions)[:50])
 
         return "\n".join(result)
@@ -1,5 +1,7 @@
+import asyncio
 import logging
 import uuid
+from collections import OrderedDict, defaultdict
 from typing import Any
 
 from mcp_server_qdrant.embeddings.base import EmbeddingProvider
@@ -12,6 +14,15 @@ logger = logging.getLogger(__name__)
 Metadata = dict[str, Any]
 ArbitraryFilter = dict[str, Any]
 
+# Points fetched per request when scrolling a whole collection
+SCROLL_PAGE_SIZE = 10000
+
+# Recent query embeddings kept in memory, so repeated queries skip the model
+QUERY_EMBEDDING_CACHE_SIZE = 256
+
+# Most entries written by a single upsert when concurrent stores are coalesced
+STORE_BATCH_SIZE = 32
+
 
 class Entry(BaseModel):
     """
@@ -58,6 +69,16 @@ class QdrantConnector:
             self._client = AsyncQdrantClient(path=qdrant_local_path)
         self._field_indexes = field_indexes
         self._reranker = reranker
+        # {query: vector}, least recently used first
+        self._query_embeddings: OrderedDict[str, list[float]] = OrderedDict()
+        # Fixed queries whose embeddings are kept for good once computed
+        self._pinned_queries: set[str] = set()
+        self._pinned_embeddings: dict[str, list[float]] = {}
+        # Pending (entry, collection_name, future) writes, started on first store
+        # and bound to the event loop that started them
+        self._store_queue: asyncio.Queue | None = None
+        self._store_flusher: asyncio.Task | None = None
+        self._store_loop: asyncio.AbstractEventLoop | None = None
 
     @property
     def collection_name(self) -> str | None:
@@ -75,6 +96,7 @@ class QdrantConnector:
     async def store(self, entry: Entry, *, collection_name: str | None = None):
         """
         Store some information in the Qdrant collection, along with the specified metadata.
+        Concurrent stores are coalesced and written by store_batch.
         :param entry: The entry to store in the Qdrant collection.
         :param collection_name: The name of the collection to store the information in, optional. If not provided,
                                 the default collection is used.
@@ -91,30 +113,118 @@ class QdrantConnector:
             f"🗄️  Storing entry to collection '{collection_name}': {content_preview}"
         )
 
+        # A flusher left over from another event loop (e.g. an earlier
+        # asyncio.run) can never run again, so start a new one on this loop
+        loop = asyncio.get_running_loop()
+        if (
+            self._store_loop is not loop
+            or self._store_flusher is None
+            or self._store_flusher.done()
+        ):
+            self._store_queue = asyncio.Queue()
+            self._store_loop = loop
+            self._store_flusher = loop.create_task(
+                self._flush_stores(self._store_queue)
+            )
+
+        # Stores arriving while a batch is being written go out together
+        stored = loop.create_future()
+        await self._store_queue.put((entry, collection_name, stored))
+        await stored
+
+    async def store_batch(
+        self, entries: list[Entry], *, collection_name: str | None = None
+    ):
+        """
+        Store several entries with a single embedding call and a single upsert.
+        :param entries: The entries to store in the Qdrant collection.
+        :param collection_name: The name of the collection to store the information in, optional. If not provided,
+                                the default collection is used.
+        """
+        collection_name = collection_name or self._default_collection_name
+        assert collection_name is not None
+
         await self._ensure_collection_exists(collection_name)
 
-        # Embed the document
-        logger.info(f"   🧮 Generating embedding for {len(entry.content)} chars...")
-        embeddings = await self._embedding_provider.embed_documents([entry.content])
-        logger.info(f"   ✓ Generated embedding vector (dim: {len(embeddings[0])})")
+        # Embed the documents
+        logger.info(f"   🧮 Generating embeddings for {len(entries)} entries...")
+        embeddings = await self._embedding_provider.embed_documents(
+            [entry.content for entry in entries]
+        )
+        logger.info(f"   ✓ Generated embedding vectors (dim: {len(embeddings[0])})")
 
         # Add to Qdrant
         vector_name = self._embedding_provider.get_vector_name()
-        payload = {"document": entry.content, METADATA_PATH: entry.metadata}
-        point_id = uuid.uuid4().hex
-        logger.info(f"   💾 Upserting point {point_id[:8]}... to Qdrant...")
+        logger.info(f"   💾 Upserting {len(entries)} points to Qdrant...")
         await self._client.upsert(
             collection_name=collection_name,
             points=[
                 models.PointStruct(
-                    id=point_id,
-                    vector={vector_name: embeddings[0]},
-                    payload=payload,
+                    id=uuid.uuid4().hex,
+                    vector={vector_name: embedding},
+                    payload={"document": entry.content, METADATA_PATH: entry.metadata},
                 )
+                for entry, embedding in zip(entries, embeddings)
             ],
         )
         logger.info("   ✓ Stored successfully")
 
+    async def close(self):
+        """
+        Stop the background writer for store(). Stores still waiting to be
+        written are cancelled; a later store() starts a new writer.
+        """
+        flusher, queue = self._store_flusher, self._store_queue
+        loop = self._store_loop
+        self._store_flusher = self._store_queue = self._store_loop = None
+        if flusher is None or loop is not asyncio.get_running_loop():
+            # A writer on another loop can't be awaited from here; that loop
+            # is gone or will drop the task when it closes
+            return
+
+        flusher.cancel()
+        try:
+            await flusher
+        except asyncio.CancelledError:
+            pass
+        while not queue.empty():
+            queue.get_nowait()[2].cancel()
+
+    async def _flush_stores(self, queue: asyncio.Queue):
+        """
+        Write queued stores in batches: each batch takes everything already waiting,
+        up to STORE_BATCH_SIZE, so a lone store is written without delay.
+        """
+        while True:
+            pending = [await queue.get()]
+            while len(pending) < STORE_BATCH_SIZE and not queue.empty():
+                pending.append(queue.get_nowait())
+
+            by_collection = defaultdict(list)
+            for entry, collection_name, stored in pending:
+                by_collection[collection_name].append((entry, stored))
+
+            try:
+                for collection_name, items in by_collection.items():
+                    try:
+                        await self.store_batch(
+                            [entry for entry, _ in items],
+                            collection_name=collection_name,
+                        )
+                    except Exception as e:
+                        for _, stored in items:
+                            if not stored.done():
+                                stored.set_exception(e)
+                    else:
+                        for _, stored in items:
+                            if not stored.done():
+                                stored.set_result(None)
+            finally:
+                # Only reached with unwritten stores if the writer was cancelled
+                for _, _, stored in pending:
+                    if not stored.done():
+                        stored.cancel()
+
     async def search(
         self,
         query: str,
@@ -122,6 +232,7 @@ class QdrantConnector:
         collection_name: str | None = None,
         limit: int = 10,
         query_filter: models.Filter | None = None,
+        metadata_fields: list[str] | None = None,
     ) -> list[Entry]:
         """
         Find points in the Qdrant collection with optional reranking.
@@ -134,6 +245,8 @@ class QdrantConnector:
                                 the default collection is used.
         :param limit: The maximum number of entries to return.
         :param query_filter: The filter to apply to the query, if any.
+        :param metadata_fields: If provided, only these metadata fields are fetched and the
+                                entries have empty content, for callers that only aggregate metadata.
 
         :return: A list of entries found.
         """
@@ -149,7 +262,7 @@ class QdrantConnector:
 
         # Embed the query
         logger.info("   🧮 Generating query embedding...")
-        query_vector = await self._embedding_provider.embed_query(query)
+        query_vector = await self._embed_query(query)
         vector_name = self._embedding_provider.get_vector_name()
         logger.info(f"   ✓ Query embedding generated (dim: {len(query_vector)})")
 
@@ -160,6 +273,12 @@ class QdrantConnector:
             search_limit = min(limit * 5, 100)
             logger.info(f"   🎯 Retrieving {search_limit} candidates for reranking")
 
+        with_payload: bool | list[str] = True
+        if metadata_fields is not None:
+            with_payload = [f"{METADATA_PATH}.{field}" for field in metadata_fields]
+            if search_limit != limit:
+                with_payload.append("document")  # the reranker scores the content
+
         # Search in Qdrant
         logger.info("   🔎 Executing vector search...")
         search_results = await self._client.query_points(
@@ -168,21 +287,155 @@ class QdrantConnector:
             using=vector_name,
             limit=search_limit,
             query_filter=query_filter,
+            with_payload=with_payload,
         )
         logger.info(f"   ✓ Search complete: {len(search_results.points)} results found")
 
-        # Apply reranking if enabled
-        if (
-            self._reranker
-            and self._reranker.is_available()
-            and len(search_results.points) > limit
-        ):
-            logger.info(
-                f"   🎯 Reranking top {limit} from {len(search_results.points)} candidates..."
+        return await self._to_entries(query, search_results.points, limit)
+
+    async def search_batch(
+        self,
+        query: str,
+        query_filters: list[models.Filter | None],
+        *,
+        collection_name: str | None = None,
+        limit: int = 10,
+    ) -> list[list[Entry]]:
+        """
+        Run one query against several filters in a single request.
+
+        The query is embedded once and all searches go to Qdrant in one
+        query_batch_points round-trip; each result list is reranked like search().
+
+        :param query: The query to use for every search.
+        :param query_filters: One filter (or None) per search.
+        :param collection_name: The name of the collection to search in, optional. If not provided,
+                                the default collection is used.
+        :param limit: The maximum number of entries to return per search.
+
+        :return: A list of entries for each filter, in order.
+        """
+        collection_name = collection_name or self._default_collection_name
+        logger.info(
+            f"🔍 Batch searching {len(query_filters)} filters in collection '{collection_name}': '{query[:100]}...' (limit={limit})"
+        )
+
+        collection_exists = await self._client.collection_exists(collection_name)
+        if not collection_exists:
+            logger.warning(f"   ⚠️  Collection '{collection_name}' does not exist")
+            return [[] for _ in query_filters]
+
+        query_vector = await self._embed_query(query)
+        vector_name = self._embedding_provider.get_vector_name()
+
+        search_limit = limit
+        if self._reranker and self._reranker.is_available():
+            search_limit = min(limit * 5, 100)
+
+        responses = await self._client.query_batch_points(
+            collection_name=collection_name,
+            requests=[
+                models.QueryRequest(
+                    query=query_vector,
+                    using=vector_name,
+                    limit=search_limit,
+                    filter=query_filter,
+                    with_payload=True,
+                )
+                for query_filter in query_filters
+            ],
+        )
+        logger.info(
+            f"   ✓ Batch search complete: {[len(r.points) for r in responses]} results found"
+        )
+
+        return list(
+            await asyncio.gather(
+                *(
+                    self._to_entries(query, response.points, limit)
+                    for response in responses
+                )
+            )
+        )
+
+    async def get_metadata_values(
+        self, key: str, *, collection_name: str | None = None
+    ) -> set[Any]:
+        """
+        Collect the distinct non-empty values of a metadata field.
+
+        Scrolls the collection fetching only that payload field, with no vectors
+        and no similarity search.
+
+        :param key: The metadata field, without the metadata prefix.
+        :param collection_name: The name of the collection to read, optional. If not provided,
+                                the default collection is used.
+
+        :return: The set of values found.
+        """
+        collection_name = collection_name or self._default_collection_name
+        if not await self._client.collection_exists(collection_name):
+            return set()
+
+        values = set()
+        offset = None
+        while True:
+            points, offset = await self._client.scroll(
+                collection_name=collection_name,
+                limit=SCROLL_PAGE_SIZE,
+                offset=offset,
+                with_payload=[f"{METADATA_PATH}.{key}"],
+                with_vectors=False,
             )
+            for point in points:
+                value = (point.payload.get(METADATA_PATH) or {}).get(key)
+                if value:
+                    values.add(value)
+            if offset is None:
+                return values
+
+    def pin_query_embeddings(self, *queries: str):
+        """
+        Keep the embeddings of these queries once computed, instead of letting them
+        age out of the recent-query cache. Meant for fixed queries the server reuses.
+        """
+        self._pinned_queries.update(queries)
+
+    async def _embed_query(self, query: str) -> list[float]:
+        """
+        Embed a query, reusing the vector if the same query was seen recently.
+        """
+        query_vector = self._pinned_embeddings.get(query)
+        if query_vector is not None:
+            return query_vector
+
+        query_vector = self._query_embeddings.get(query)
+        if query_vector is not None:
+            self._query_embeddings.move_to_end(query)
+            return query_vector
+
+        query_vector = await self._embedding_provider.embed_query(query)
+        if query in self._pinned_queries:
+            self._pinned_embeddings[query] = query_vector
+            return query_vector
+
+        self._query_embeddings[query] = query_vector
+        if len(self._query_embeddings) > QUERY_EMBEDDING_CACHE_SIZE:
+            self._query_embeddings.popitem(last=False)
+        return query_vector
+
+    async def _to_entries(
+        self, query: str, points: list[models.ScoredPoint], limit: int
+    ) -> list[Entry]:
+        """
+        Convert search hits to entries, reranking them first if enabled.
+        """
+        # Apply reranking if enabled
+        if self._reranker and self._reranker.is_available() and len(points) > limit:
+            logger.info(f"   🎯 Reranking top {limit} from {len(points)} candidates...")
 
-            documents = [result.payload["document"] for result in search_results.points]
-            scores = [result.score for result in search_results.points]
+            documents = [result.payload.get("document", "") for result in points]
+            scores = [result.score for result in points]
 
             # Rerank and get top-k indices
             reranked_indices = await self._reranker.rerank(
@@ -192,10 +445,10 @@ class QdrantConnector:
             # Return reranked results
             results = []
             for idx, score in reranked_indices:
-                result = search_results.points[idx]
+                result = points[idx]
                 results.append(
                     Entry(
-                        content=result.payload["document"],
+                        content=result.payload.get("document", ""),
                         metadata=result.payload.get("metadata"),
                     )
                 )
@@ -207,10 +460,10 @@ class QdrantConnector:
             # Return results without reranking
             return [
                 Entry(
-                    content=result.payload["document"],
+                    content=result.payload.get("document", ""),
                     metadata=result.payload.get("metadata"),
                 )
-                for result in search_results.points[:limit]
+                for result in points[:limit]
             ]
 
     async def _ensure_collection_exists(self, collection_name: str):
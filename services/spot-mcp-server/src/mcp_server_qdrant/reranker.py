@@ -8,10 +8,32 @@ relevance scoring than dot product similarity alone.
 
 import asyncio
 import logging
-from typing import List, Tuple
+from functools import lru_cache
+from typing import FrozenSet, List, Tuple
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Below this many documents, fallback reranking takes well under a millisecond
+# and runs on the event loop instead of the default executor
+INLINE_RERANK_MAX_DOCUMENTS = 256
+
+
+@lru_cache(maxsize=1024)
+def _query_terms(query: str) -> FrozenSet[str]:
+    """Distinct lowercase terms of a query; cached since queries get reranked again."""
+    return frozenset(query.lower().split())
+
+
+def _top_by_score(scores: List[float], top_k: int) -> List[Tuple[int, float]]:
+    """(index, score) pairs of the top_k scores, highest first."""
+    if all(a >= b for a, b in zip(scores, scores[1:])):
+        # Already in order, as vector search returns them: no sort needed
+        return list(enumerate(scores[:top_k]))
+    results = sorted(enumerate(scores), key=lambda x: x[1], reverse=True)
+    return results[:top_k]
+
 
 class LocalReranker:
     """
@@ -76,23 +98,22 @@ class LocalReranker:
         """
         if not self.enabled or not documents:
             # Fallback: use original scores
-            results = [(i, score) for i, score in enumerate(scores)]
-            results.sort(key=lambda x: x[1], reverse=True)
-            return results[:top_k]
+            return _top_by_score(scores, top_k)
 
         try:
             # TODO: Implement true cross-encoder reranking when FastEmbed API stabilizes
             # For now, use distance-based reranking with query term matching
-            loop = asyncio.get_event_loop()
+            if len(documents) < INLINE_RERANK_MAX_DOCUMENTS:
+                # Cheaper to score in place than to hand off to a worker thread
+                return self._fallback_rerank(query, documents, scores, top_k)
+            loop = asyncio.get_running_loop()
             reranked = await loop.run_in_executor(
                 None, self._fallback_rerank, query, documents, scores, top_k
             )
             return reranked
         except Exception as e:
             logger.warning(f"⚠️  Reranking failed: {e}, using original scores")
-            results = [(i, score) for i, score in enumerate(scores)]
-            results.sort(key=lambda x: x[1], reverse=True)
-            return results[:top_k]
+            return _top_by_score(scores, top_k)
 
     def _fallback_rerank(
         self, query: str, documents: List[str], scores: List[float], top_k: int
@@ -102,24 +123,25 @@ class LocalReranker:
 
         This is a simple heuristic that boosts documents containing query terms.
         """
-        query_terms = set(query.lower().split())
-        reranked = []
-
-        for i, (doc, score) in enumerate(zip(documents, scores)):
-            doc_lower = doc.lower()
-
-            # Count query term matches
-            term_matches = sum(1 for term in query_terms if term in doc_lower)
-            match_ratio = term_matches / len(query_terms) if query_terms else 0
+        query_terms = _query_terms(query)
+        boosted = np.asarray(scores, dtype=np.float64)
+
+        if query_terms:
+            # Query term matches of every document in one (documents x terms) matrix
+            docs_lower = [doc.lower() for doc in documents]
+            matches = np.fromiter(
+                (term in doc for doc in docs_lower for term in query_terms),
+                dtype=bool,
+                count=len(docs_lower) * len(query_terms),
+            ).reshape(len(docs_lower), len(query_terms))
+            match_ratio = matches.sum(axis=1) / len(query_terms)
 
             # Boost score based on term matches (up to 10% boost)
-            boosted_score = score * (1.0 + 0.1 * match_ratio)
-
-            reranked.append((i, boosted_score))
+            boosted = boosted * (1.0 + 0.1 * match_ratio)
 
-        # Sort by boosted score
-        reranked.sort(key=lambda x: x[1], reverse=True)
-        return reranked[:top_k]
+        # Sort by boosted score (stable, so ties keep their original order)
+        top = np.argsort(-boosted, kind="stable")[:top_k]
+        return list(zip(top.tolist(), boosted[top].tolist()))
 
     def is_available(self) -> bool:
         """Check if reranker is available and enabled."""
@@ -1,3 +1,4 @@
+from functools import cached_property
 from typing import Literal
 
 from mcp_server_qdrant.embeddings.types import EmbeddingProviderType
@@ -97,6 +98,11 @@ class FilterableField(BaseModel):
         description="Whether the field is required for the filter.",
     )
 
+    @cached_property
+    def qdrant_key(self) -> str:
+        """Payload key of the field in Qdrant, computed once per field."""
+        return f"{METADATA_PATH}.{self.name}"
+
 
 class QdrantSettings(BaseSettings):
     """
@@ -152,6 +158,11 @@ class QdrantSettings(BaseSettings):
                 field_type="float",
                 condition=">=",
             ),
+            FilterableField(
+                name="tag_list",
+                description="Tags of the entry, matched exactly by the search tool",
+                field_type="keyword",
+            ),
         ]
 
     def filterable_fields_dict(self) -> dict[str, FilterableField]:
@@ -13,9 +13,12 @@ Runs as a background service to:
 import asyncio
 import datetime
 import logging
+import re
+import time
 from collections import defaultdict
 from typing import Any, Dict, List
 
+import numpy as np
 from mcp_server_qdrant.embeddings.factory import create_embedding_provider
 from mcp_server_qdrant.qdrant import Entry, QdrantConnector
 from mcp_server_qdrant.settings import EmbeddingProviderSettings, QdrantSettings
@@ -200,8 +203,6 @@ class MemoryJanitor:
 
     def _normalize_workspace_name(self, name: str) -> str:
         """Normalize workspace name to be consistent"""
-        import re
-
         normalized = name.lower()
         normalized = re.sub(r"[^\w\-]", "-", normalized)  # Replace non-alphanumeric
         normalized = re.sub(r"-+", "-", normalized)  # Collapse multiple hyphens
@@ -245,48 +246,15 @@ class MemoryJanitor:
             return list(vector_data.values())[0] if vector_data else None
         return vector_data
 
-    def _wrap_vector(self, vector_array):
-        """Wrap vector array in named vector dict for Qdrant upsert"""
-        if vector_array is None:
-            return None
-        # Use the FastEmbed vector name format: fast-{model_name}
-        # For BAAI/bge-large-en-v1.5, this is "fast-bge-large-en-v1.5"
-        vector_name = "fast-bge-large-en-v1.5"
-        return {vector_name: vector_array}
-
     async def _update_memory_metadata(self, memory_id: str, metadata: dict):
         """Update memory metadata in Qdrant"""
         try:
-            # Get the memory point to preserve its vector
-            points = await self.qdrant._client.retrieve(
-                collection_name=self.qdrant.collection_name,
-                ids=[memory_id],
-                with_vectors=True,
-                with_payload=True,
-            )
-
-            if not points:
-                logger.warning(f"Memory {memory_id} not found for metadata update")
-                return
-
-            point = points[0]
-
-            # Extract vector (handle named vectors)
-            vector = self._extract_vector(point.vector)
-
-            # Update with new metadata
-            await self.qdrant._client.upsert(
+            # Overwrite only the metadata key server-side; the vector and
+            # document are left untouched, so nothing needs to be fetched.
+            await self.qdrant._client.set_payload(
                 collection_name=self.qdrant.collection_name,
-                points=[
-                    models.PointStruct(
-                        id=memory_id,
-                        vector=self._wrap_vector(vector),
-                        payload={
-                            "document": point.payload.get("document", ""),
-                            "metadata": metadata,
-                        },
-                    )
-                ],
+                payload={"metadata": metadata},
+                points=[memory_id],
             )
         except Exception as e:
             logger.error(f"Failed to update metadata for {memory_id}: {e}")
@@ -404,50 +372,48 @@ class MemoryJanitor:
 
         all_memories = await self._get_all_memories()
 
-        # Batch updates for better performance
+        # Batch payload updates so one request covers many points
         batch_size = 100
-        points_to_update = []
+        operations = []
 
         for memory in all_memories:
             # Calculate health score (0-100)
             health = await self._calculate_health_score(memory)
 
             # Update metadata with health score
-            if hasattr(memory, "id") and memory.metadata and hasattr(memory, "vector"):
+            if memory.id and memory.metadata:
                 memory.metadata["health_score"] = health
                 memory.metadata["health_updated_at"] = datetime.datetime.now(
                     datetime.timezone.utc
                 ).timestamp()
 
-                points_to_update.append(
-                    models.PointStruct(
-                        id=memory.id,
-                        vector=self._wrap_vector(memory.vector),
-                        payload={
-                            "document": memory.content,
-                            "metadata": memory.metadata,
-                        },
+                operations.append(
+                    models.SetPayloadOperation(
+                        set_payload=models.SetPayload(
+                            payload={"metadata": memory.metadata},
+                            points=[memory.id],
+                        )
                     )
                 )
 
                 self.stats["health_updated"] += 1
 
-                # Upsert in batches
-                if len(points_to_update) >= batch_size:
-                    await self.qdrant._client.upsert(
+                # Flush in batches
+                if len(operations) >= batch_size:
+                    await self.qdrant._client.batch_update_points(
                         collection_name=self.qdrant.collection_name,
-                        points=points_to_update,
+                        update_operations=operations,
                     )
                     logger.info(
                         f"  Updated {self.stats['health_updated']} health scores..."
                     )
-                    points_to_update = []
+                    operations = []
 
-        # Upsert remaining points
-        if points_to_update:
-            await self.qdrant._client.upsert(
+        # Flush remaining operations
+        if operations:
+            await self.qdrant._client.batch_update_points(
                 collection_name=self.qdrant.collection_name,
-                points=points_to_update,
+                update_operations=operations,
             )
 
         logger.info(
@@ -466,24 +432,31 @@ class MemoryJanitor:
             return []
 
         all_memories = []
-        offset = 0
         batch_size = 1000
 
-        while True:
+        def fetch_page(offset):
             # Use scroll API for efficient pagination
-            batch = await self.qdrant._client.scroll(
-                collection_name=self.qdrant.collection_name,
-                limit=batch_size,
-                offset=offset,
-                with_payload=True,
-                with_vectors=True,
+            return asyncio.create_task(
+                self.qdrant._client.scroll(
+                    collection_name=self.qdrant.collection_name,
+                    limit=batch_size,
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=True,
+                )
             )
 
-            if not batch[0]:  # No more results
-                break
+        next_page = fetch_page(None)
+
+        while next_page is not None:
+            points, next_offset = await next_page
+
+            # Request the following page before converting this one, so the
+            # round-trip overlaps with building Entry objects
+            next_page = fetch_page(next_offset) if next_offset is not None else None
 
             # Convert to Entry objects
-            for point in batch[0]:
+            for point in points:
                 entry = Entry(
                     content=point.payload.get("document", ""),
                     metadata=point.payload.get("metadata", {}),
@@ -493,19 +466,13 @@ class MemoryJanitor:
                 entry.vector = self._extract_vector(point.vector)
                 all_memories.append(entry)
 
-            offset += len(batch[0])
-            logger.info(f"Loaded {offset} memories...")
-
-            if len(batch[0]) < batch_size:
-                break
+            logger.info(f"Loaded {len(all_memories)} memories...")
 
         logger.info(f"Total memories loaded: {len(all_memories)}")
         return all_memories
 
     async def _calculate_similarity(self, mem1: Entry, mem2: Entry) -> float:
         """Calculate semantic similarity between two memories using cosine similarity"""
-        import numpy as np
-
         # Get vectors (should be stored in Entry objects)
         vec1 = mem1.vector if hasattr(mem1, "vector") else None
         vec2 = mem2.vector if hasattr(mem2, "vector") else None
@@ -628,7 +595,7 @@ class MemoryJanitor:
         # - Last accessed (recent = better)
         # - Content quality (length, structure)
 
-        now = datetime.datetime.now(datetime.timezone.utc).timestamp()
+        now = time.time()
         created = meta.get("timestamp", now)
         last_accessed = meta.get("last_accessed", created)
         access_count = meta.get("access_count", 0)
@@ -691,7 +658,10 @@ async def main():
     janitor = MemoryJanitor(qdrant)
 
     # Run maintenance
-    report = await janitor.run_maintenance()
+    try:
+        report = await janitor.run_maintenance()
+    finally:
+        embedding_provider.close()
 
     logger.info(f"📊 Maintenance Report: {report}")
     logger.info("✅ Memory Janitor complete")
@@ -0,0 +1,68 @@
+import asyncio
+import hashlib
+from collections.abc import Iterator
+
+import pytest
+from mcp_server_qdrant import mcp_server
+from mcp_server_qdrant.embeddings.base import EmbeddingProvider
+from mcp_server_qdrant.mcp_server import QdrantMCPServer
+from mcp_server_qdrant.qdrant import QdrantConnector
+from mcp_server_qdrant.settings import (
+    EmbeddingProviderSettings,
+    QdrantSettings,
+    RerankerSettings,
+    ToolSettings,
+)
+
+
+class FakeEmbeddingProvider(EmbeddingProvider):
+    """
+    Deterministic embeddings derived from a hash of the text, so tests run
+    without downloading a model.
+    """
+
+    def __init__(self):
+        self.embedded_documents: list[str] = []
+
+    def _embed(self, text: str) -> list[float]:
+        digest = hashlib.sha1(text.encode("utf-8")).digest()
+        return [byte / 255 + 0.01 for byte in digest[:8]]
+
+    async def embed_documents(self, documents: list[str]) -> list[list[float]]:
+        self.embedded_documents.extend(documents)
+        return [self._embed(document) for document in documents]
+
+    async def embed_query(self, query: str) -> list[float]:
+        return self._embed(query)
+
+    def get_vector_name(self) -> str:
+        return "fake"
+
+    def get_vector_size(self) -> int:
+        return 8
+
+
+@pytest.fixture
+def connector() -> Iterator[QdrantConnector]:
+    """A connector to an in-memory Qdrant using the fake embedding provider."""
+    connector = QdrantConnector(":memory:", None, "test", FakeEmbeddingProvider())
+    yield connector
+    asyncio.run(connector.close())
+
+
+@pytest.fixture
+def server(monkeypatch) -> Iterator[QdrantMCPServer]:
+    """A server backed by an in-memory Qdrant and the fake embedding provider."""
+    monkeypatch.setattr(
+        mcp_server,
+        "create_embedding_provider",
+        lambda settings: FakeEmbeddingProvider(),
+    )
+    server = QdrantMCPServer(
+        tool_settings=ToolSettings(),
+        qdrant_settings=QdrantSettings(QDRANT_URL=":memory:", COLLECTION_NAME="test"),
+        embedding_provider_settings=EmbeddingProviderSettings(),
+        reranker_settings=RerankerSettings(RERANKER_ENABLED=False),
+    )
+    yield server
+    asyncio.run(server.qdrant_connector.close())
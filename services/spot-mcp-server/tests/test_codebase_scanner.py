@@ -0,0 +1,25 @@
+from mcp_server_qdrant.analysis import codebase_scanner
+from mcp_server_qdrant.analysis.codebase_scanner import CodebaseScanner
+
+
+def test_parallel_scan_matches_serial_scan(tmp_path, monkeypatch, caplog):
+    for i in range(4):
+        (tmp_path / f"module_{i}.py").write_text(
+            f"import os\nfrom typing import Any\n\nclass Model{i}:\n"
+            f"    def run(self, x):\n        return x\n\nVALUE = {i}\n"
+        )
+    (tmp_path / "notes.md").write_text("# Notes\n\nSome text")
+    scanner = CodebaseScanner(str(tmp_path))
+    paths = sorted(tmp_path.iterdir())
+
+    monkeypatch.setattr(codebase_scanner, "PARALLEL_MIN_FILES", len(paths) + 1)
+    serial = scanner._analyze_files(paths)
+
+    monkeypatch.setattr(codebase_scanner, "PARALLEL_MIN_FILES", 1)
+    monkeypatch.setattr(codebase_scanner.os, "cpu_count", lambda: 2)
+    parallel = scanner._analyze_files(paths)
+
+    assert "Parallel scan unavailable" not in caplog.text
+    assert parallel == serial
+    assert serial[0].imports == ["os", "typing", "typing.Any"]
+    assert serial[0].exports == ["Model0", "VALUE"]
@@ -0,0 +1,106 @@
+import json
+import os
+
+import pytest
+from mcp_server_qdrant import incremental
+from mcp_server_qdrant.incremental import FileHashTracker
+
+
+def write_files(tmp_path, count: int) -> list[str]:
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"module_{i}.py"
+        path.write_text(f"value = {i}\n")
+        paths.append(str(path))
+    return paths
+
+
+def test_get_changed_files_reports_deleted_file(tmp_path):
+    tracker = FileHashTracker()
+    # Enough files to use the thread pool
+    paths = write_files(tmp_path, incremental.PARALLEL_HASH_MIN_FILES)
+    assert tracker.get_changed_files(paths) == paths
+
+    os.remove(paths[0])
+
+    assert tracker.get_changed_files(paths) == [paths[0]]
+    assert paths[0] not in tracker.file_hashes
+    assert all(path in tracker.file_hashes for path in paths[1:])
+
+
+def test_get_changed_files_reports_missing_file_serially(tmp_path):
+    tracker = FileHashTracker()
+    paths = write_files(tmp_path, 2)
+    missing = str(tmp_path / "missing.py")
+
+    assert tracker.get_changed_files([*paths, missing]) == [*paths, missing]
+    assert missing not in tracker.file_hashes
+
+
+def test_has_changed_reports_deleted_file(tmp_path):
+    tracker = FileHashTracker()
+    (path,) = write_files(tmp_path, 1)
+    assert tracker.has_changed(path)
+
+    os.remove(path)
+
+    assert tracker.has_changed(path)
+    assert path not in tracker.file_hashes
+
+
+def test_load_round_trip_keeps_extra_extensions(tmp_path):
+    (path,) = write_files(tmp_path, 1)
+    tracker = FileHashTracker(extra_extensions=[".VUE"])
+    tracker.has_changed(path)
+    state_path = tmp_path / "state.json"
+    tracker.save(state_path)
+
+    loaded = FileHashTracker.load(state_path, extra_extensions=[".vue"])
+
+    assert loaded.file_hashes == tracker.file_hashes
+    assert loaded.compute_root() == tracker.compute_root()
+    assert loaded.is_indexable("component.vue")
+    assert not loaded.has_changed(path)
+
+
+@pytest.mark.parametrize(
+    "state",
+    [
+        {"version": incremental.STATE_VERSION},
+        {"version": incremental.STATE_VERSION, "file_hashes": {}, "last_check": {}},
+        {
+            "version": incremental.STATE_VERSION,
+            "file_hashes": [],
+            "last_check": {},
+            "file_stats": {},
+        },
+        {
+            "version": incremental.STATE_VERSION,
+            "file_hashes": {"a.py": 1},
+            "last_check": {},
+            "file_stats": {},
+        },
+        {
+            "version": incremental.STATE_VERSION,
+            "file_hashes": {"a.py": "00"},
+            "last_check": {"a.py": None},
+            "file_stats": {},
+        },
+        {
+            "version": incremental.STATE_VERSION,
+            "file_hashes": {"a.py": "00"},
+            "last_check": {},
+            "file_stats": {"a.py": [1]},
+        },
+    ],
+)
+def test_load_malformed_state_starts_empty(tmp_path, state):
+    state_path = tmp_path / "state.json"
+    state_path.write_text(json.dumps(state))
+
+    tracker = FileHashTracker.load(state_path, extra_extensions=[".vue"])
+
+    assert tracker.file_hashes == {}
+    assert tracker.last_check == {}
+    assert tracker.file_stats == {}
+    assert tracker.is_indexable("component.vue")
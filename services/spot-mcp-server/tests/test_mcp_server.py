@@ -0,0 +1,115 @@
+import asyncio
+import types
+
+from fastmcp import Client
+from mcp_server_qdrant import mcp_server
+from mcp_server_qdrant.mcp_server import QdrantMCPServer
+from mcp_server_qdrant.qdrant import Entry
+
+
+def memory_tool(server: QdrantMCPServer, name: str):
+    """
+    Return a tool function defined in setup_memory_tools, bound to the server.
+    Some of these (e.g. search_by_time) are not registered with FastMCP, so
+    they are rebuilt from the method's code.
+    """
+    for const in QdrantMCPServer.setup_memory_tools.__code__.co_consts:
+        if isinstance(const, types.CodeType) and const.co_name == name:
+            closure = tuple(types.CellType(server) for _ in const.co_freevars)
+            return types.FunctionType(const, vars(mcp_server), name, None, closure)
+    raise LookupError(name)
+
+
+def store_entries(server: QdrantMCPServer, entries: list[Entry]):
+    async def store():
+        for entry in entries:
+            await server.qdrant_connector.store(entry)
+        await server.qdrant_connector.close()
+
+    asyncio.run(store())
+
+
+def search_by_time(server: QdrantMCPServer, category=None) -> list[str]:
+    tool = memory_tool(server, "search_by_time")
+    return asyncio.run(
+        tool(
+            None,
+            query="notes",
+            since=None,
+            until=None,
+            category=category,
+            collection_name=None,
+        )
+    )
+
+
+def test_current_workspace_defaults_to_none(server):
+    assert server.current_workspace is None
+
+
+def test_search_by_time_without_category(server):
+    store_entries(
+        server,
+        [
+            Entry(content="deploy notes", metadata={"category": "memory"}),
+            Entry(content="api code", metadata={"category": "codebase"}),
+        ],
+    )
+
+    results = search_by_time(server)
+
+    assert results[0] == "Results for 'notes'"
+    assert len(results) == 3
+
+
+def test_search_by_time_categories_exclude_other_workspace_code(server):
+    server.current_workspace = "ws"
+    store_entries(
+        server,
+        [
+            Entry(
+                content="own code", metadata={"category": "codebase", "workspace": "ws"}
+            ),
+            Entry(
+                content="other code",
+                metadata={"category": "codebase", "workspace": "other"},
+            ),
+            Entry(
+                content="other memory",
+                metadata={"category": "memory", "workspace": "other"},
+            ),
+            Entry(content="a decision", metadata={"category": "decision"}),
+        ],
+    )
+
+    results = search_by_time(server, category=["codebase", "memory"])
+
+    assert results[0] == "Results for 'notes' (category=codebase,memory)"
+    found = "\n".join(results[1:])
+    assert "own code" in found
+    assert "other memory" in found
+    assert "other code" not in found
+    assert "a decision" not in found
+
+
+def test_workspace_filter_is_not_shared_between_calls(server):
+    server.current_workspace = "ws"
+
+    first = server._add_workspace_filter()
+    first.must.append("changed by a caller")
+    second = server._add_workspace_filter()
+
+    assert second is not first
+    assert len(second.must) == 1
+    assert second.must[0].match.value == "ws"
+
+
+def test_shutdown_stops_the_store_writer(server):
+    async def store_while_running():
+        async with Client(server):
+            await server.qdrant_connector.store(Entry(content="deploy notes"))
+            assert server.qdrant_connector._store_flusher is not None
+
+    asyncio.run(store_while_running())
+
+    assert server.qdrant_connector._store_flusher is None
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+from mcp_server_qdrant.qdrant import Entry, QdrantConnector
+
+
+def test_store_from_separate_event_loops(connector: QdrantConnector):
+    async def store(content: str):
+        # Bounded, so a writer stuck on a dead loop fails the test instead of hanging
+        await asyncio.wait_for(connector.store(Entry(content=content)), timeout=5)
+
+    asyncio.run(store("first run"))
+    asyncio.run(store("second run"))
+
+    async def search():
+        return await connector.search("run", limit=10)
+
+    assert {entry.content for entry in asyncio.run(search())} == {
+        "first run",
+        "second run",
+    }
+
+
+def test_store_after_loop_stopped_without_cleanup(connector: QdrantConnector):
+    async def store(content: str):
+        await asyncio.wait_for(connector.store(Entry(content=content)), timeout=5)
+
+    # Unlike asyncio.run, stopping the loop directly leaves the writer pending
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(store("first loop"))
+
+        asyncio.run(store("second loop"))
+    finally:
+        pending = asyncio.all_tasks(loop)
+        for task in pending:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        loop.close()
+
+    async def search():
+        return await connector.search("loop", limit=10)
+
+    assert {entry.content for entry in asyncio.run(search())} == {
+        "first loop",
+        "second loop",
+    }
+
+
+def test_concurrent_stores_are_all_written(connector: QdrantConnector):
+    async def store_all():
+        await asyncio.gather(
+            *(connector.store(Entry(content=f"entry {i}")) for i in range(5))
+        )
+        await connector.close()
+
+    asyncio.run(store_all())
+
+    embedded = connector._embedding_provider.embedded_documents
+    assert sorted(embedded) == [f"entry {i}" for i in range(5)]
+
+
+def test_close_stops_the_store_writer(connector: QdrantConnector):
+    async def store_then_close():
+        await connector.store(Entry(content="before close"))
+        flusher = connector._store_flusher
+        await connector.close()
+        return flusher
+
+    flusher = asyncio.run(store_then_close())
+
+    assert flusher.cancelled()
+    assert connector._store_flusher is None
+
+
+def test_close_cancels_stores_not_yet_written(connector: QdrantConnector):
+    async def close_while_storing():
+        pending = asyncio.ensure_future(connector.store(Entry(content="pending")))
+        # Let store() queue the entry before the writer is stopped
+        await asyncio.sleep(0)
+        await connector.close()
+        with pytest.raises(asyncio.CancelledError):
+            await pending
+
+    asyncio.run(close_while_storing())